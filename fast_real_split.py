@@ -4,11 +4,15 @@ Fast video splitting using ffmpeg directly (much faster than moviepy)
 """
 
 import os
-import subprocess
 import time
+import concurrent.futures
 from typing import List
+from ffmpeg_utils import get_logger, probe_duration, copy_split_segments
 
-def fast_real_split_video(video_path: str, num_parts: int = 3, output_dir: str = None) -> List[str]:
+# Progress messages go through a background writer so console I/O never stalls a split
+logger = get_logger(__name__)
+
+def fast_real_split_video(video_path: str, num_parts: int = 3, output_dir: str = None, fast_seek: bool = True, ffmpeg_path: str = "ffmpeg") -> List[str]:
     """
     Split video into actual time segments using ffmpeg directly (MUCH FASTER)
     
@@ -16,12 +20,14 @@ def fast_real_split_video(video_path: str, num_parts: int = 3, output_dir: str =
         video_path: Path to the video file
         num_parts: Number of parts to split into
         output_dir: Output directory
+        fast_seek: Skip accurate seeking and regenerate timestamps on input
+        ffmpeg_path: ffmpeg executable to run (e.g. moviepy's bundled binary)
     
     Returns:
         List of output file paths
     """
     if not os.path.exists(video_path):
-        print(f"❌ Video file not found: {video_path}")
+        logger.error(f"❌ Video file not found: {video_path}")
         return []
     
     if output_dir is None:
@@ -32,80 +38,41 @@ def fast_real_split_video(video_path: str, num_parts: int = 3, output_dir: str =
     base_name = os.path.splitext(os.path.basename(video_path))[0]
     output_files = []
     
-    print(f"⚡ FAST REAL splitting video into {num_parts} parts")
-    print(f"📁 Output directory: {output_dir}")
+    logger.info(f"⚡ FAST REAL splitting video into {num_parts} parts")
+    logger.info(f"📁 Output directory: {output_dir}")
     
     try:
-        # Get video duration using ffprobe
-        print("📹 Getting video duration...")
-        cmd = [
-            'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-            '-of', 'csv=p=0', video_path
-        ]
-        # Run ffprobe command with hidden console window (Windows)
-        if hasattr(subprocess, 'STARTUPINFO'):  # Windows only
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-            result = subprocess.run(cmd, capture_output=True, text=True, startupinfo=startupinfo)
-        else:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+        # Get video duration from the mp4 header (ffprobe for other containers)
+        logger.info("📹 Getting video duration...")
+        duration = probe_duration(video_path, ffmpeg_path)
         
-        if result.returncode != 0:
-            print(f"❌ Failed to get video duration: {result.stderr}")
+        if duration is None:
+            logger.error("❌ Failed to get video duration")
             return []
         
-        duration = float(result.stdout.strip())
-        print(f"⏱️ Video duration: {duration:.1f} seconds")
+        logger.info(f"⏱️ Video duration: {duration:.1f} seconds")
         
         part_duration = duration / num_parts
         
+        segments = []
         for i in range(num_parts):
             start_time = i * part_duration
             end_time = min((i + 1) * part_duration, duration)
             
             output_file = os.path.join(output_dir, f"{base_name}_part_{i+1}.mp4")
             
-            print(f"✂️ Creating part {i+1}/{num_parts}: {start_time:.1f}s - {end_time:.1f}s")
-            
-            # Use ffmpeg to extract segment without re-encoding (FASTEST)
-            cmd = [
-                'ffmpeg', '-i', video_path,
-                '-ss', str(start_time),
-                '-t', str(end_time - start_time),
-                '-c', 'copy',  # Copy streams without re-encoding
-                '-avoid_negative_ts', 'make_zero',
-                '-y',  # Overwrite output files
-                output_file
-            ]
-            
-            try:
-                # Run ffmpeg command with hidden console window (Windows)
-                if hasattr(subprocess, 'STARTUPINFO'):  # Windows only
-                    startupinfo = subprocess.STARTUPINFO()
-                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                    startupinfo.wShowWindow = subprocess.SW_HIDE
-                    result = subprocess.run(cmd, capture_output=True, text=True, startupinfo=startupinfo)
-                else:
-                    result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.returncode == 0 and os.path.exists(output_file):
-                    file_size = os.path.getsize(output_file)
-                    print(f"✅ Part {i+1} created: {file_size} bytes")
-                    output_files.append(output_file)
-                else:
-                    print(f"❌ Failed to create part {i+1}")
-                    if result.stderr:
-                        print(f"Error: {result.stderr}")
-                    
-            except Exception as e:
-                print(f"❌ Error creating part {i+1}: {e}")
+            logger.info(f"✂️ Creating part {i+1}/{num_parts}: {start_time:.1f}s - {end_time:.1f}s")
+            # A part ending at the end of the video is left open so ffmpeg copies up to EOF
+            length = None if end_time >= duration else end_time - start_time
+            segments.append((i, start_time, length, output_file))
+        
+        output_files = copy_split_segments(ffmpeg_path, video_path, segments, output_dir, base_name, fast_seek)
         
     except Exception as e:
-        print(f"❌ Error processing video: {e}")
+        logger.error(f"❌ Error processing video: {e}")
         return []
     
-    print(f"🎉 Fast real splitting completed: {len(output_files)} parts created")
+    logger.info(f"🎉 Fast real splitting completed: {len(output_files)} parts created")
     return output_files
 
 def test_fast_real_split():
@@ -121,19 +88,25 @@ def test_fast_real_split():
         return False
     
     print(f"📁 Testing with video: {test_video}")
-    print(f"📊 File size: {os.path.getsize(test_video)} bytes")
+    input_size = os.path.getsize(test_video)
+    print(f"📊 File size: {input_size} bytes")
     
     # Test with different part counts
-    for num_parts in [2, 3]:
-        print(f"\n🔧 Testing with {num_parts} parts...")
-        
+    part_counts = [2, 3]
+    
+    def run_split(num_parts):
+        # Each part count writes to its own directory so concurrent runs don't collide
+        output_dir = os.path.join(os.path.dirname(test_video), f"split_test_{num_parts}")
         start_time = time.time()
-        
-        # Split the video
-        result = fast_real_split_video(test_video, num_parts)
-        
-        end_time = time.time()
-        duration = end_time - start_time
+        result = fast_real_split_video(test_video, num_parts, output_dir)
+        return result, time.time() - start_time
+    
+    # Run all part counts at the same time
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(part_counts)) as executor:
+        runs = list(executor.map(run_split, part_counts))
+    
+    for num_parts, (result, duration) in zip(part_counts, runs):
+        print(f"\n🔧 Testing with {num_parts} parts...")
         
         if result:
             print(f"✅ Split into {len(result)} parts in {duration:.1f} seconds")
@@ -142,10 +115,14 @@ def test_fast_real_split():
             # Clean up test files
             for part_file in result:
                 try:
-                    os.remove(part_file)
-                    print(f"🧹 Cleaned up: {os.path.basename(part_file)}")
-                except:
+                    os.unlink(part_file)
+                except OSError:
                     pass
+            try:
+                os.rmdir(os.path.dirname(result[0]))
+            except OSError:
+                pass
+            print(f"🧹 Cleaned up {len(result)} parts")
         else:
             print(f"❌ Failed to split into {num_parts} parts")
     
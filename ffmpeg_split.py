@@ -5,10 +5,14 @@ Video splitting using ffmpeg bundled with moviepy
 
 import os
 import time
-import subprocess
+import concurrent.futures
 from typing import List
+from ffmpeg_utils import get_logger, probe_duration, copy_split_segments
 from moviepy.config import get_setting
 
+# Progress messages go through a background writer so console I/O never stalls a split
+logger = get_logger(__name__)
+
 def get_ffmpeg_path():
     """Get the path to ffmpeg bundled with moviepy"""
     try:
@@ -22,7 +26,7 @@ def get_ffmpeg_path():
     except:
         return "ffmpeg"
 
-def ffmpeg_split_video(video_path: str, num_parts: int = 3, output_dir: str = None, max_duration: int = 113) -> List[str]:
+def ffmpeg_split_video(video_path: str, num_parts: int = 3, output_dir: str = None, max_duration: int = 113, fast_seek: bool = True) -> List[str]:
     """
     Split video into actual time segments using ffmpeg (bundled with moviepy)
     
@@ -31,12 +35,13 @@ def ffmpeg_split_video(video_path: str, num_parts: int = 3, output_dir: str = No
         num_parts: Number of parts to split into
         output_dir: Output directory
         max_duration: Maximum duration per part in seconds (default: 113 seconds = 1:53 minutes)
+        fast_seek: Skip accurate seeking and regenerate timestamps on input
     
     Returns:
         List of output file paths
     """
     if not os.path.exists(video_path):
-        print(f"❌ Video file not found: {video_path}")
+        logger.error(f"❌ Video file not found: {video_path}")
         return []
     
     if output_dir is None:
@@ -47,26 +52,21 @@ def ffmpeg_split_video(video_path: str, num_parts: int = 3, output_dir: str = No
     base_name = os.path.splitext(os.path.basename(video_path))[0]
     output_files = []
     
-    print(f"🎬 FFMPEG splitting video into {num_parts} parts")
-    print(f"📁 Output directory: {output_dir}")
+    logger.info(f"🎬 FFMPEG splitting video into {num_parts} parts")
+    logger.info(f"📁 Output directory: {output_dir}")
     
     try:
         # Get ffmpeg path
         ffmpeg_path = get_ffmpeg_path()
-        print(f"🔧 Using ffmpeg: {ffmpeg_path}")
-        
-        # Get video duration using moviepy (more reliable)
-        print("📹 Getting video duration...")
+        logger.info(f"🔧 Using ffmpeg: {ffmpeg_path}")
         
-        try:
-            from moviepy.editor import VideoFileClip
-            video = VideoFileClip(video_path)
-            duration = video.duration
-            video.close()
-            print(f"✅ Got duration via moviepy: {duration:.1f} seconds")
-        except Exception as e:
-            print(f"❌ Failed to get duration: {e}")
+        # Get video duration from the mp4 header (ffprobe for other containers)
+        logger.info("📹 Getting video duration...")
+        duration = probe_duration(video_path, ffmpeg_path)
+        if duration is None:
+            logger.error("❌ Failed to get duration")
             return []
+        logger.info(f"✅ Got duration: {duration:.1f} seconds")
         
         # Calculate parts based on maximum duration limit
         max_duration_seconds = max_duration
@@ -80,16 +80,17 @@ def ffmpeg_split_video(video_path: str, num_parts: int = 3, output_dir: str = No
         if duration >= 3.0:  # Minimum 3 seconds for TikTok
             actual_num_parts = max(1, actual_num_parts)
         
-        print(f"📊 Video duration: {duration:.1f}s, Max part duration: {max_duration_seconds}s")
-        print(f"📊 Creating {actual_num_parts} parts (each {part_duration}s)")
-        print(f"📊 Max possible parts: {max_possible_parts}")
+        logger.info(f"📊 Video duration: {duration:.1f}s, Max part duration: {max_duration_seconds}s")
+        logger.info(f"📊 Creating {actual_num_parts} parts (each {part_duration}s)")
+        logger.info(f"📊 Max possible parts: {max_possible_parts}")
         
+        segments = []
         for i in range(actual_num_parts):
             start_time = i * part_duration
             
             # Check if we have enough video content for this part
             if start_time >= duration:
-                print(f"⚠️ Part {i+1}: Not enough video content (start time {start_time:.1f}s >= duration {duration:.1f}s)")
+                logger.warning(f"⚠️ Part {i+1}: Not enough video content (start time {start_time:.1f}s >= duration {duration:.1f}s)")
                 break
                 
             end_time = min((i + 1) * part_duration, duration)
@@ -97,51 +98,23 @@ def ffmpeg_split_video(video_path: str, num_parts: int = 3, output_dir: str = No
             # Check if part duration is too short (TikTok minimum is ~3 seconds)
             part_actual_duration = end_time - start_time
             if part_actual_duration < 3.0:
-                print(f"⚠️ Part {i+1}: Duration too short ({part_actual_duration:.1f}s < 3s), skipping")
+                logger.warning(f"⚠️ Part {i+1}: Duration too short ({part_actual_duration:.1f}s < 3s), skipping")
                 continue
             
             output_file = os.path.join(output_dir, f"{base_name}_part_{i+1}.mp4")
             
-            print(f"✂️ Creating part {i+1}/{actual_num_parts}: {start_time:.1f}s - {end_time:.1f}s")
-            
-            # Use ffmpeg to extract segment without re-encoding (FASTEST)
-            cmd = [
-                ffmpeg_path, '-i', video_path,
-                '-ss', str(start_time),
-                '-t', str(end_time - start_time),
-                '-c', 'copy',  # Copy streams without re-encoding
-                '-avoid_negative_ts', 'make_zero',
-                '-y',  # Overwrite output files
-                output_file
-            ]
-            
-            try:
-                # Run ffmpeg command with hidden console window (Windows)
-                if hasattr(subprocess, 'STARTUPINFO'):  # Windows only
-                    startupinfo = subprocess.STARTUPINFO()
-                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                    startupinfo.wShowWindow = subprocess.SW_HIDE
-                    result = subprocess.run(cmd, capture_output=True, text=True, startupinfo=startupinfo)
-                else:
-                    result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.returncode == 0 and os.path.exists(output_file):
-                    file_size = os.path.getsize(output_file)
-                    print(f"✅ Part {i+1} created: {file_size} bytes")
-                    output_files.append(output_file)
-                else:
-                    print(f"❌ Failed to create part {i+1}")
-                    if result.stderr:
-                        print(f"Error: {result.stderr}")
-                    
-            except Exception as e:
-                print(f"❌ Error creating part {i+1}: {e}")
+            logger.info(f"✂️ Creating part {i+1}/{actual_num_parts}: {start_time:.1f}s - {end_time:.1f}s")
+            # A part ending at the end of the video is left open so ffmpeg copies up to EOF
+            length = None if end_time >= duration else part_actual_duration
+            segments.append((i, start_time, length, output_file))
+        
+        output_files = copy_split_segments(ffmpeg_path, video_path, segments, output_dir, base_name, fast_seek)
         
     except Exception as e:
-        print(f"❌ Error processing video: {e}")
+        logger.error(f"❌ Error processing video: {e}")
         return []
     
-    print(f"🎉 FFMPEG splitting completed: {len(output_files)} parts created")
+    logger.info(f"🎉 FFMPEG splitting completed: {len(output_files)} parts created")
     return output_files
 
 def test_ffmpeg_split():
@@ -157,24 +130,30 @@ def test_ffmpeg_split():
         return False
     
     print(f"📁 Testing with video: {test_video}")
-    print(f"📊 File size: {os.path.getsize(test_video)} bytes")
+    input_size = os.path.getsize(test_video)
+    print(f"📊 File size: {input_size} bytes")
     
     # Test with different part counts
-    for num_parts in [2, 3]:
-        print(f"\n🔧 Testing with {num_parts} parts...")
-        
+    part_counts = [2, 3]
+    
+    def run_split(num_parts):
+        # Each part count writes to its own directory so concurrent runs don't collide
+        output_dir = os.path.join(os.path.dirname(test_video), f"split_test_{num_parts}")
         start_time = time.time()
-        
-        # Split the video
-        result = ffmpeg_split_video(test_video, num_parts)
-        
-        end_time = time.time()
-        duration = end_time - start_time
+        result = ffmpeg_split_video(test_video, num_parts, output_dir)
+        return result, time.time() - start_time
+    
+    # Run all part counts at the same time
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(part_counts)) as executor:
+        runs = list(executor.map(run_split, part_counts))
+    
+    for num_parts, (result, duration) in zip(part_counts, runs):
+        print(f"\n🔧 Testing with {num_parts} parts...")
         
         if result:
             print(f"✅ Split into {len(result)} parts in {duration:.1f} seconds")
             print(f"⚡ Average time per part: {duration/num_parts:.1f} seconds")
-        
+            print(f"📁 Parts saved in: {os.path.dirname(result[0])}")
         else:
             print(f"❌ Failed to split into {num_parts} parts")
     
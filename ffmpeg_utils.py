@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for running ffmpeg/ffprobe subprocesses
+"""
+
+import asyncio
+import atexit
+import bisect
+import functools
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+from typing import Any, Coroutine, List, Optional, Tuple
+
+class _StdoutHandler(logging.StreamHandler):
+    """Write to whatever sys.stdout is at emit time, like print() does"""
+    
+    @property
+    def stream(self):
+        return sys.stdout
+    
+    @stream.setter
+    def stream(self, value):
+        pass
+    
+    def emit(self, record):
+        if sys.stdout is not None:  # No console in windowed PyInstaller builds
+            super().emit(record)
+
+_log_queue = None
+_log_lock = threading.Lock()
+
+def _get_log_queue() -> "queue.SimpleQueue":
+    """Start the background thread that writes split progress messages (once)"""
+    global _log_queue
+    with _log_lock:
+        if _log_queue is None:
+            handler = _StdoutHandler()
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            _log_queue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(_log_queue, handler)
+            listener.start()
+            atexit.register(listener.stop)  # Flush pending messages on exit
+    return _log_queue
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a logger whose console output is written by a background thread
+
+    Keeps console I/O out of the split loops; messages are printed as-is,
+    emoji prefixes included.
+
+    Args:
+        name: Logger name (usually __name__)
+
+    Returns:
+        Configured logger
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(logging.handlers.QueueHandler(_get_log_queue()))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False  # Root may have basicConfig handlers (pubsub monitor)
+    return logger
+
+def _build_startupinfo() -> Optional["subprocess.STARTUPINFO"]:
+    """Build the STARTUPINFO used to hide console windows (Windows only)"""
+    if not hasattr(subprocess, 'STARTUPINFO'):
+        return None
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return startupinfo
+
+# Built once at import and reused for every subprocess call (None outside Windows)
+STARTUPINFO = _build_startupinfo()
+
+# Larger demuxer packet queue for the single-pass split on Windows (input option, goes before -i)
+WINDOWS_INPUT_ARGS = ['-thread_queue_size', '1024'] if os.name == 'nt' else []
+
+# Input options that skip ffmpeg's accurate-seek decode and regenerate missing
+# timestamps; with -c copy the cut lands on a keyframe either way
+FAST_SEEK_INPUT_ARGS = ['-noaccurate_seek', '-fflags', '+genpts']
+
+def input_args(fast_seek: bool = True) -> List[str]:
+    """ffmpeg input options (placed before -i) for the split commands"""
+    return WINDOWS_INPUT_ARGS + (FAST_SEEK_INPUT_ARGS if fast_seek else [])
+
+# 1 MB pipe buffer instead of the small Windows default when reading ffmpeg's stderr
+PIPE_BUFSIZE = 1 << 20
+
+def _completed(cmd: List[str], returncode: int, stdout: Optional[bytes], stderr: bytes,
+               keep_stderr: bool = False) -> subprocess.CompletedProcess:
+    """Wrap raw process output, decoding stderr only when the command failed (or it was asked for)"""
+    return subprocess.CompletedProcess(
+        cmd, returncode,
+        stdout.decode('utf-8', errors='replace') if stdout is not None else '',
+        stderr.decode('utf-8', errors='replace') if returncode != 0 or keep_stderr else ''
+    )
+
+def run_ffmpeg(cmd: List[str], capture_stdout: bool = False, keep_stderr: bool = False) -> subprocess.CompletedProcess:
+    """
+    Run an ffmpeg/ffprobe command with a hidden console window
+
+    Args:
+        cmd: Command line to run
+        capture_stdout: Keep stdout (ffprobe output); ffmpeg's own stdout is discarded
+        keep_stderr: Decode stderr on success too (to parse ffmpeg's report)
+
+    Returns:
+        CompletedProcess with text stdout, and stderr text only on failure unless keep_stderr
+    """
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=PIPE_BUFSIZE,
+        startupinfo=STARTUPINFO
+    )
+    return _completed(cmd, result.returncode, result.stdout, result.stderr, keep_stderr)
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_PROGRESS_TIME_RE = re.compile(r"time=\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+def _hms_to_seconds(hours: str, minutes: str, seconds: str) -> float:
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+def parse_input_duration(stderr: str) -> Optional[float]:
+    """Duration of the first input from ffmpeg's "Duration: HH:MM:SS.ss" line, or None"""
+    match = _DURATION_RE.search(stderr)
+    return _hms_to_seconds(*match.groups()) if match else None
+
+def parse_output_time(stderr: str) -> Optional[float]:
+    """Duration written to the output, from the last "time=" of ffmpeg's progress report, or None"""
+    matches = _PROGRESS_TIME_RE.findall(stderr)
+    return _hms_to_seconds(*matches[-1]) if matches else None
+
+def output_size(path: str) -> Optional[int]:
+    """Size of a file in bytes from a single stat call, or None if it doesn't exist"""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+def link_or_copy(src: str, dst: str) -> bool:
+    """
+    Make dst a copy of src without running ffmpeg
+
+    Hardlinks when src and dst are on the same filesystem (instant, no extra
+    disk space) and falls back to a plain file copy otherwise.
+
+    Returns:
+        True if dst was created
+    """
+    try:
+        if os.path.exists(dst):
+            if os.path.samefile(src, dst):
+                return True
+            os.remove(dst)  # Overwrite like ffmpeg -y
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+        return True
+    except OSError as e:
+        get_logger(__name__).warning(f"⚠️ Could not copy {src} to {dst}: {e}")
+        return False
+
+# Containers whose duration can be read straight from the moov/mvhd atom
+MP4_EXTENSIONS = ('.mp4', '.m4v', '.mov')
+
+def _find_atom(f, end: int, atom_type: bytes) -> Optional[int]:
+    """Scan sibling atoms up to end and return the payload end of atom_type, leaving f at its payload"""
+    while f.tell() + 8 <= end:
+        start = f.tell()
+        size, kind = struct.unpack('>I4s', f.read(8))
+        if size == 1:  # 64-bit extended size follows the type
+            size = struct.unpack('>Q', f.read(8))[0]
+        elif size == 0:  # Atom runs to the end of its parent
+            size = end - start
+        if size < 8:
+            return None
+        if kind == atom_type:
+            return start + size
+        f.seek(start + size)
+    return None
+
+def mp4_duration(video_path: str) -> Optional[float]:
+    """
+    Get duration of an MP4/MOV file by parsing the moov/mvhd atom directly
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        Duration in seconds, or None if the file could not be parsed
+    """
+    try:
+        with open(video_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            file_end = f.tell()
+            f.seek(0)
+            
+            moov_end = _find_atom(f, file_end, b'moov')
+            if moov_end is None or _find_atom(f, moov_end, b'mvhd') is None:
+                return None
+            
+            version = f.read(4)[0]  # version byte + 3 flag bytes
+            if version == 1:
+                f.seek(16, os.SEEK_CUR)  # 64-bit creation/modification times
+                timescale, duration = struct.unpack('>IQ', f.read(12))
+            else:
+                f.seek(8, os.SEEK_CUR)  # 32-bit creation/modification times
+                timescale, duration = struct.unpack('>II', f.read(8))
+    except (OSError, struct.error, IndexError):
+        return None
+    
+    if not timescale or not duration:
+        return None
+    return duration / timescale
+
+def get_ffprobe_path(ffmpeg_path: str = "ffmpeg") -> str:
+    """Get the ffprobe that sits next to the given ffmpeg, or ffprobe from PATH"""
+    directory, name = os.path.split(ffmpeg_path)
+    if directory:
+        candidate = os.path.join(directory, name.replace('ffmpeg', 'ffprobe'))
+        if os.path.exists(candidate):
+            return candidate
+    return "ffprobe"
+
+def probe_duration(video_path: str, ffmpeg_path: str = "ffmpeg") -> Optional[float]:
+    """
+    Get video duration in seconds
+
+    MP4/MOV files are read directly from the container header without
+    spawning a process. Anything else goes through ffprobe, falling back
+    to the "Duration:" line printed by "ffmpeg -i" when no ffprobe is
+    available (moviepy's bundled ffmpeg ships without one).
+
+    Args:
+        video_path: Path to the video file
+        ffmpeg_path: ffmpeg executable used to locate ffprobe
+
+    Returns:
+        Duration in seconds, or None if it could not be determined
+    """
+    if video_path.lower().endswith(MP4_EXTENSIONS):
+        duration = mp4_duration(video_path)
+        if duration is not None:
+            return duration
+    
+    cmd = [
+        get_ffprobe_path(ffmpeg_path), '-v', 'quiet', '-show_entries', 'format=duration',
+        '-of', 'csv=p=0', video_path
+    ]
+    try:
+        result = run_ffmpeg(cmd, capture_stdout=True)
+        if result.returncode == 0:
+            return float(result.stdout.strip())
+    except (OSError, ValueError):
+        pass
+    
+    # ffmpeg exits non-zero without an output file, so stderr is always decoded here
+    try:
+        result = run_ffmpeg([ffmpeg_path, '-hide_banner', '-i', video_path])
+    except OSError:
+        return None
+    return parse_input_duration(result.stderr)
+
+def get_keyframes(video_path: str, ffmpeg_path: str = "ffmpeg") -> List[float]:
+    """
+    Get the keyframe timestamps of the first video stream with one ffprobe scan
+
+    Reads packet flags only, so nothing is decoded.
+
+    Args:
+        video_path: Path to the video file
+        ffmpeg_path: ffmpeg executable used to locate ffprobe
+
+    Returns:
+        Sorted keyframe timestamps in seconds (empty if ffprobe is unavailable)
+    """
+    cmd = [
+        get_ffprobe_path(ffmpeg_path), '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', video_path
+    ]
+    try:
+        result = run_ffmpeg(cmd, capture_stdout=True)
+    except OSError:
+        return []
+    if result.returncode != 0:
+        return []
+    
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags:
+            try:
+                keyframes.append(float(pts_time))
+            except ValueError:
+                continue  # pts_time is N/A for some packets
+    keyframes.sort()
+    return keyframes
+
+def snap_to_keyframes(segments: list, keyframes: List[float]) -> list:
+    """
+    Move each part's start back to the keyframe at or before it
+
+    Stream copy can only start a part on a keyframe, so cutting exactly
+    there gives clean parts and lets ffmpeg seek straight to them. Parts
+    stay contiguous: each part now ends where the next snapped part starts.
+
+    Args:
+        segments: Contiguous (index, start_time, length, output_file) tuples; a
+            length of None means the part runs to the end of the video
+        keyframes: Sorted keyframe timestamps from get_keyframes()
+
+    Returns:
+        New list of segment tuples with snapped start times and lengths
+    """
+    if not keyframes or len(segments) < 2:
+        return segments
+    
+    starts = []
+    for _, start_time, _, _ in segments:
+        k = bisect.bisect_right(keyframes, start_time) - 1
+        snapped = keyframes[k] if k >= 0 else start_time
+        # Two parts can't share a keyframe; keep the original cut if they would
+        if starts and snapped <= starts[-1]:
+            snapped = start_time
+        starts.append(snapped)
+    
+    snapped_segments = []
+    for n, (i, start_time, length, output_file) in enumerate(segments):
+        if n + 1 < len(segments):
+            length = starts[n + 1] - starts[n]
+        elif length is not None:
+            length = start_time + length - starts[n]
+        snapped_segments.append((i, starts[n], length, output_file))
+    return snapped_segments
+
+# H.264 encoders in order of preference, with settings tuned for speed; the one
+# table used by every re-encode (real_split parts and the video extension)
+H264_ENCODERS = [
+    ('h264_nvenc', ['-preset', 'fast', '-cq', '28']),
+    ('h264_qsv', ['-preset', 'veryfast', '-global_quality', '28']),
+    ('h264_videotoolbox', ['-b:v', '5M']),
+    ('libx264', ['-preset', 'ultrafast', '-tune', 'fastdecode', '-crf', '28']),
+]
+
+@functools.lru_cache(maxsize=None)
+def get_h264_encoder(ffmpeg_path: str = "ffmpeg") -> Tuple[str, List[str]]:
+    """
+    Pick the fastest H.264 encoder this ffmpeg build provides
+
+    Hardware encoders (NVENC, Quick Sync, VideoToolbox) are preferred over
+    libx264. Being compiled in doesn't guarantee the hardware is present,
+    so callers should retry with the libx264 entry if an encode fails.
+
+    Returns:
+        Tuple of (encoder name, encoder-specific ffmpeg arguments)
+    """
+    try:
+        result = run_ffmpeg([ffmpeg_path, '-hide_banner', '-encoders'], capture_stdout=True)
+        available = result.stdout if result.returncode == 0 else ''
+    except OSError:
+        available = ''
+    
+    for name, args in H264_ENCODERS:
+        if f" {name} " in available:
+            return name, args
+    return H264_ENCODERS[-1]
+
+async def run_ffmpeg_async(cmd: List[str], capture_stdout: bool = False) -> subprocess.CompletedProcess:
+    """
+    Run an ffmpeg/ffprobe command on the event loop with a hidden console window
+
+    Args:
+        cmd: Command line to run
+        capture_stdout: Keep stdout (ffprobe output); ffmpeg's own stdout is discarded
+
+    Returns:
+        CompletedProcess with text stdout, and stderr text only on failure
+    """
+    kwargs = {'startupinfo': STARTUPINFO} if STARTUPINFO is not None else {}
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        **kwargs
+    )
+    stdout, stderr = await proc.communicate()
+    return _completed(cmd, proc.returncode, stdout, stderr)
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion from synchronous code
+
+    Uses asyncio.run() directly, or a helper thread with its own event loop
+    when called from inside a running loop (e.g. the pubsub monitor).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    outcome = {}
+
+    def _runner():
+        try:
+            outcome['result'] = asyncio.run(coro)
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=_runner, daemon=True)
+    thread.start()
+    thread.join()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+async def run_copy_segment(ffmpeg_path: str, video_path: str, start_time: float, duration: Optional[float],
+                           output_file: str, fast_seek: bool = True) -> subprocess.CompletedProcess:
+    """Extract a single segment with ffmpeg stream copy"""
+    # -ss before -i seeks in the container index instead of reading up to the start point
+    cmd = [ffmpeg_path, *input_args(fast_seek), '-ss', str(start_time), '-i', video_path]
+    # The last part runs to EOF, so it needs no -t
+    if duration is not None:
+        cmd += ['-t', str(duration)]
+    cmd += [
+        '-map', '0:v', '-map', '0:a?',  # Same streams as the single-pass split
+        '-c', 'copy',  # Copy streams without re-encoding
+        '-avoid_negative_ts', 'make_zero',
+        '-y',  # Overwrite output files
+        output_file
+    ]
+    return await run_ffmpeg_async(cmd)
+
+async def run_copy_segments_async(ffmpeg_path: str, video_path: str, segments: list, fast_seek: bool = True) -> List[str]:
+    """Extract every part with its own ffmpeg process, running them concurrently"""
+    logger = get_logger(__name__)
+    # Stream copies are independent and I/O-bound, so launch all parts at once
+    results = await asyncio.gather(
+        *(run_copy_segment(ffmpeg_path, video_path, start_time, length, output_file, fast_seek)
+          for _, start_time, length, output_file in segments),
+        return_exceptions=True
+    )
+    
+    output_files = []
+    for (i, _, _, output_file), result in zip(segments, results):
+        try:
+            if isinstance(result, Exception):
+                raise result
+            
+            # One stat call covers both the existence check and the size
+            file_size = output_size(output_file) if result.returncode == 0 else None
+            if file_size is not None:
+                logger.info(f"✅ Part {i+1} created: {file_size} bytes")
+                output_files.append(output_file)
+            else:
+                logger.error(f"❌ Failed to create part {i+1}")
+                if result.stderr:
+                    logger.error(f"Error: {result.stderr}")
+                
+        except Exception as e:
+            logger.error(f"❌ Error creating part {i+1}: {e}")
+    
+    return output_files
+
+def run_segment_muxer(ffmpeg_path: str, video_path: str, segments: list, output_dir: str, base_name: str,
+                      fast_seek: bool = True) -> Optional[List[str]]:
+    """
+    Write every part in a single ffmpeg pass using the segment muxer
+
+    Returns:
+        List of output file paths, or None if ffmpeg failed
+    """
+    logger = get_logger(__name__)
+    segment_times = ','.join(f"{start_time:.3f}" for _, start_time, _, _ in segments[1:])
+    # The segment muxer expands %d in the output name, so escape literal percent signs
+    output_pattern = os.path.join(output_dir, base_name.replace('%', '%%') + "_part_%d.mp4")
+    
+    cmd = [ffmpeg_path, *input_args(fast_seek), '-i', video_path]
+    if segments[-1][2] is not None:
+        cmd += ['-t', f"{segments[-1][1] + segments[-1][2]:.3f}"]
+    cmd += [
+        '-map', '0:v', '-map', '0:a?',
+        '-c', 'copy',  # Copy streams without re-encoding
+        '-f', 'segment',
+        '-segment_times', segment_times,
+        '-segment_start_number', '1',  # Matches the {base_name}_part_{i+1}.mp4 naming
+        '-segment_time_delta', '0.05',
+        '-reset_timestamps', '1',
+        '-avoid_negative_ts', 'make_zero',
+        '-y',  # Overwrite output files
+        output_pattern
+    ]
+    result = run_ffmpeg(cmd)
+    
+    if result.returncode != 0:
+        logger.warning("⚠️ Single-pass split failed, falling back to per-part extraction")
+        if result.stderr:
+            logger.error(f"Error: {result.stderr}")
+        return None
+    
+    output_files = []
+    for i, _, _, output_file in segments:
+        file_size = output_size(output_file)
+        if file_size is not None:
+            logger.info(f"✅ Part {i+1} created: {file_size} bytes")
+            output_files.append(output_file)
+        else:
+            logger.error(f"❌ Failed to create part {i+1}")
+    
+    return output_files
+
+def copy_split_segments(ffmpeg_path: str, video_path: str, segments: list, output_dir: str, base_name: str,
+                        fast_seek: bool = True) -> List[str]:
+    """
+    Write the given parts of a video with stream copy
+
+    Snaps the cuts to keyframes, links/copies the file when the only part is
+    the whole video, and otherwise writes every part in one segment-muxer pass,
+    falling back to one ffmpeg process per part if that fails.
+
+    Args:
+        ffmpeg_path: ffmpeg executable to run
+        video_path: Path to the video file
+        segments: Contiguous (index, start_time, length, output_file) tuples; a
+            length of None means the part runs to the end of the video
+        output_dir: Directory the parts are written to
+        base_name: Output name stem; parts are named {base_name}_part_{i+1}.mp4
+        fast_seek: Skip accurate seeking and regenerate timestamps on input
+
+    Returns:
+        List of output file paths
+    """
+    if len(segments) > 1:
+        # Cut on keyframes so each stream-copied part starts cleanly
+        segments = snap_to_keyframes(segments, get_keyframes(video_path, ffmpeg_path))
+    
+    output_files = None
+    if len(segments) == 1 and segments[0][1] == 0 and segments[0][2] is None and video_path.lower().endswith('.mp4'):
+        # The only part is the whole video, so link/copy it instead of remuxing
+        output_file = segments[0][3]
+        if link_or_copy(video_path, output_file):
+            get_logger(__name__).info(f"✅ Part 1 created: {output_size(output_file)} bytes")
+            output_files = [output_file]
+    elif len(segments) > 1:
+        # Read the input once and write every part in a single ffmpeg pass
+        output_files = run_segment_muxer(ffmpeg_path, video_path, segments, output_dir, base_name, fast_seek)
+    
+    if output_files is None:
+        output_files = run_sync(run_copy_segments_async(ffmpeg_path, video_path, segments, fast_seek)) if segments else []
+    return output_files
@@ -5,10 +5,40 @@ Real video splitting that actually crops videos into time segments
 
 import os
 import time
+import concurrent.futures
 from typing import List
-from moviepy.editor import VideoFileClip
+from ffmpeg_utils import get_logger, H264_ENCODERS, run_ffmpeg, probe_duration, output_size, get_h264_encoder
+from fast_real_split import fast_real_split_video
+from ffmpeg_split import get_ffmpeg_path
 
-def real_split_video(video_path: str, num_parts: int = 3, output_dir: str = None) -> List[str]:
+# Progress messages go through a background writer so console I/O never stalls a split
+logger = get_logger(__name__)
+
+def _encode_one_segment(ffmpeg_path: str, video_path: str, start_time: float, end_time: float, output_file: str) -> str:
+    """Re-encode a single time segment with ffmpeg (runs in a worker thread)"""
+    # Hardware encoders can be compiled in without a usable device, so keep libx264 as a retry
+    attempts = [get_h264_encoder(ffmpeg_path)]
+    if attempts[0][0] != H264_ENCODERS[-1][0]:
+        attempts.append(H264_ENCODERS[-1])
+    
+    for encoder, encoder_args in attempts:
+        cmd = [
+            ffmpeg_path, '-ss', str(start_time), '-i', video_path,
+            '-t', str(end_time - start_time),
+            '-c:v', encoder, *encoder_args,
+            '-c:a', 'aac',
+            '-movflags', '+faststart',
+            '-y',  # Overwrite output files
+            output_file
+        ]
+        result = run_ffmpeg(cmd)
+        if result.returncode == 0:
+            return output_file
+        logger.warning(f"⚠️ {encoder} failed for {os.path.basename(output_file)}")
+    
+    raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()[-300:]}")
+
+def real_split_video(video_path: str, num_parts: int = 3, output_dir: str = None, force_reencode: bool = False) -> List[str]:
     """
     Split video into actual time segments (crops the video)
     
@@ -16,12 +46,20 @@ def real_split_video(video_path: str, num_parts: int = 3, output_dir: str = None
         video_path: Path to the video file
         num_parts: Number of parts to split into
         output_dir: Output directory
+        force_reencode: Re-encode each part instead of copying the streams
     
     Returns:
         List of output file paths
     """
+    # moviepy's bundled ffmpeg, so frozen builds without a system ffmpeg still work
+    ffmpeg_path = get_ffmpeg_path()
+    
+    if not force_reencode:
+        # YouTube downloads are already H.264/AAC, so a stream copy is all that's needed
+        return fast_real_split_video(video_path, num_parts, output_dir, ffmpeg_path=ffmpeg_path)
+    
     if not os.path.exists(video_path):
-        print(f"❌ Video file not found: {video_path}")
+        logger.error(f"❌ Video file not found: {video_path}")
         return []
     
     if output_dir is None:
@@ -32,74 +70,62 @@ def real_split_video(video_path: str, num_parts: int = 3, output_dir: str = None
     base_name = os.path.splitext(os.path.basename(video_path))[0]
     output_files = []
     
-    print(f"🎬 REAL splitting video into {num_parts} parts")
-    print(f"📁 Output directory: {output_dir}")
+    logger.info(f"🎬 REAL splitting video into {num_parts} parts")
+    logger.info(f"📁 Output directory: {output_dir}")
     
     try:
-        # Load video once
-        print("📹 Loading video...")
-        video = VideoFileClip(video_path)
-        duration = video.duration
+        # Get video duration from the mp4 header (ffprobe for other containers)
+        logger.info("📹 Loading video...")
+        duration = probe_duration(video_path, ffmpeg_path)
+        if duration is None:
+            logger.error("❌ Failed to get video duration")
+            return []
         
-        print(f"⏱️ Video duration: {duration:.1f} seconds")
+        logger.info(f"⏱️ Video duration: {duration:.1f} seconds")
+        logger.info(f"🔧 Encoding with {get_h264_encoder(ffmpeg_path)[0]}")
         part_duration = duration / num_parts
         
+        segments = []
         for i in range(num_parts):
             start_time = i * part_duration
             end_time = min((i + 1) * part_duration, duration)
             
             output_file = os.path.join(output_dir, f"{base_name}_part_{i+1}.mp4")
             
-            print(f"✂️ Creating part {i+1}/{num_parts}: {start_time:.1f}s - {end_time:.1f}s")
+            logger.info(f"✂️ Creating part {i+1}/{num_parts}: {start_time:.1f}s - {end_time:.1f}s")
+            segments.append((i, start_time, end_time, output_file))
+        
+        # Encoding is CPU/GPU-bound and the encoders are already multi-threaded,
+        # so only run two parts at a time to avoid oversubscribing
+        created = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(num_parts, 2)) as executor:
+            futures = {
+                executor.submit(_encode_one_segment, ffmpeg_path, video_path, start_time, end_time, output_file): i
+                for i, start_time, end_time, output_file in segments
+            }
             
-            try:
-                # Extract the time segment
-                part_video = video.subclip(start_time, end_time)
-                
-                # Write with optimized settings for speed
-                part_video.write_videofile(
-                    output_file,
-                    verbose=False,
-                    logger=None,
-                    codec='libx264',
-                    audio_codec='aac',
-                    preset='ultrafast',  # Fastest encoding
-                    threads=4,
-                    audio=True,
-                    temp_audiofile=None,
-                    remove_temp=True,
-                    audio_fps=22050,  # Lower audio quality for speed
-                    audio_nbytes=2,
-                    audio_bufsize=1000,
-                    ffmpeg_params=[
-                        '-strict', 'experimental',
-                        '-movflags', '+faststart',
-                        '-tune', 'fastdecode',
-                        '-crf', '28'  # Higher compression (faster)
-                    ]
-                )
-                
-                # Close the part video to free memory
-                part_video.close()
-                
-                if os.path.exists(output_file):
-                    file_size = os.path.getsize(output_file)
-                    print(f"✅ Part {i+1} created: {file_size} bytes")
-                    output_files.append(output_file)
-                else:
-                    print(f"❌ Failed to create part {i+1}")
+            for future in concurrent.futures.as_completed(futures):
+                i = futures[future]
+                try:
+                    output_file = future.result()
                     
-            except Exception as e:
-                print(f"❌ Error creating part {i+1}: {e}")
+                    file_size = output_size(output_file)
+                    if file_size is not None:
+                        logger.info(f"✅ Part {i+1} created: {file_size} bytes")
+                        created[i] = output_file
+                    else:
+                        logger.error(f"❌ Failed to create part {i+1}")
+                        
+                except Exception as e:
+                    logger.error(f"❌ Error creating part {i+1}: {e}")
         
-        # Close the main video
-        video.close()
+        output_files = [created[i] for i in sorted(created)]
         
     except Exception as e:
-        print(f"❌ Error loading video: {e}")
+        logger.error(f"❌ Error loading video: {e}")
         return []
     
-    print(f"🎉 Real splitting completed: {len(output_files)} parts created")
+    logger.info(f"🎉 Real splitting completed: {len(output_files)} parts created")
     return output_files
 
 def test_real_split():
@@ -115,19 +141,25 @@ def test_real_split():
         return False
     
     print(f"📁 Testing with video: {test_video}")
-    print(f"📊 File size: {os.path.getsize(test_video)} bytes")
+    input_size = os.path.getsize(test_video)
+    print(f"📊 File size: {input_size} bytes")
     
     # Test with different part counts
-    for num_parts in [5]:
-        print(f"\n🔧 Testing with {num_parts} parts...")
-        
+    part_counts = [5]
+    
+    def run_split(num_parts):
+        # Each part count writes to its own directory so concurrent runs don't collide
+        output_dir = os.path.join(os.path.dirname(test_video), f"split_test_{num_parts}")
         start_time = time.time()
-        
-        # Split the video
-        result = real_split_video(test_video, num_parts)
-        
-        end_time = time.time()
-        duration = end_time - start_time
+        result = real_split_video(test_video, num_parts, output_dir)
+        return result, time.time() - start_time
+    
+    # Run all part counts at the same time
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(part_counts)) as executor:
+        runs = list(executor.map(run_split, part_counts))
+    
+    for num_parts, (result, duration) in zip(part_counts, runs):
+        print(f"\n🔧 Testing with {num_parts} parts...")
         
         if result:
             print(f"✅ Split into {len(result)} parts in {duration:.1f} seconds")
@@ -136,10 +168,14 @@ def test_real_split():
             # Clean up test files
             for part_file in result:
                 try:
-                    os.remove(part_file)
-                    print(f"🧹 Cleaned up: {os.path.basename(part_file)}")
-                except:
+                    os.unlink(part_file)
+                except OSError:
                     pass
+            try:
+                os.rmdir(os.path.dirname(result[0]))
+            except OSError:
+                pass
+            print(f"🧹 Cleaned up {len(result)} parts")
         else:
             print(f"❌ Failed to split into {num_parts} parts")
     
@@ -6,20 +6,31 @@ Checks for new videos every second using scrapetube.
 
 import sys
 import time
-from datetime import datetime
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
 from test_scrapetube_fetch import YouTubeChannelMonitor
 
-def monitor_channel_realtime(channel_id: str, max_videos: int = 5):
+# Longest wait between checks while YouTube requests keep failing
+MAX_BACKOFF = 60.0
+
+def _backoff_delay(poll_interval: float, errors: int) -> float:
+    """Exponential backoff after consecutive failures, with jitter so retries don't line up"""
+    delay = min(poll_interval * 2 ** errors, MAX_BACKOFF)
+    return delay + random.uniform(0, delay * 0.1)
+
+def monitor_channel_realtime(channel_id: str, max_videos: int = 5, poll_interval: float = 1.0):
     """
     Monitor a single channel every second for new videos.
     
     Args:
         channel_id: YouTube channel ID
         max_videos: Maximum videos to check per cycle
+        poll_interval: Seconds to wait between checks
     """
     print(f"🚀 Real-time monitoring started!")
     print(f"📺 Channel: {channel_id}")
-    print(f"⏱️ Checking every second for new videos")
+    print(f"⏱️ Checking every {poll_interval:g}s for new videos")
     print(f"🔍 Checking latest {max_videos} videos per cycle")
     print("Press Ctrl+C to stop")
     print("="*60)
@@ -27,18 +38,28 @@ def monitor_channel_realtime(channel_id: str, max_videos: int = 5):
     # Create monitor with persistent cache
     monitor = YouTubeChannelMonitor(f"realtime_{channel_id}.json")
     check_count = 0
+    errors = 0
     start_time = time.time()
+    # Show status roughly every 30 seconds to avoid spam
+    status_every = max(1, int(30 / poll_interval))
     
     try:
         while True:
             check_count += 1
-            current_time = datetime.now().strftime("%H:%M:%S")
             
             # Get new videos
-            new_videos = monitor.get_new_videos(channel_id, max_videos)
+            try:
+                new_videos = monitor.get_new_videos(channel_id, max_videos)
+            except Exception as e:
+                errors += 1
+                delay = _backoff_delay(poll_interval, errors)
+                print(f"❌ [{time.strftime('%H:%M:%S')}] Check failed ({e}), retrying in {delay:.0f}s")
+                time.sleep(delay)
+                continue
+            errors = 0
             
             if new_videos:
-                print(f"\n🎉 [{current_time}] Found {len(new_videos)} new videos!")
+                print(f"\n🎉 [{time.strftime('%H:%M:%S')}] Found {len(new_videos)} new videos!")
                 for video in new_videos:
                     print(f"📺 {video['title']}")
                     print(f"🔗 {video['url']}")
@@ -47,12 +68,11 @@ def monitor_channel_realtime(channel_id: str, max_videos: int = 5):
                     print("-" * 40)
             else:
                 # Show status every 30 seconds to avoid spam
-                if check_count % 30 == 0:
+                if check_count % status_every == 0:
                     elapsed = time.time() - start_time
-                    print(f"[{current_time}] Check #{check_count} ({elapsed:.0f}s elapsed): No new videos")
+                    print(f"[{time.strftime('%H:%M:%S')}] Check #{check_count} ({elapsed:.0f}s elapsed): No new videos")
             
-            # No wait - maximum speed
-            # Continuous monitoring with no delays
+            time.sleep(poll_interval)
             
     except KeyboardInterrupt:
         elapsed = time.time() - start_time
@@ -60,19 +80,20 @@ def monitor_channel_realtime(channel_id: str, max_videos: int = 5):
         print("💾 Cache saved for next run")
 
 
-def monitor_multiple_channels_realtime(channel_ids: list, max_videos: int = 3):
+def monitor_multiple_channels_realtime(channel_ids: list, max_videos: int = 3, poll_interval: float = 1.0):
     """
     Monitor multiple channels every second.
     
     Args:
         channel_ids: List of YouTube channel IDs
         max_videos: Maximum videos to check per channel
+        poll_interval: Seconds to wait between checks
     """
     print(f"🚀 Multi-channel real-time monitoring started!")
     print(f"📺 Channels: {len(channel_ids)}")
     for i, channel in enumerate(channel_ids, 1):
         print(f"  {i}. {channel}")
-    print(f"⏱️ Checking every second for new videos")
+    print(f"⏱️ Checking every {poll_interval:g}s for new videos")
     print(f"🔍 Checking latest {max_videos} videos per channel")
     print("Press Ctrl+C to stop")
     print("="*60)
@@ -82,39 +103,71 @@ def monitor_multiple_channels_realtime(channel_ids: list, max_videos: int = 3):
     for channel_id in channel_ids:
         monitors[channel_id] = YouTubeChannelMonitor(f"realtime_{channel_id}.json")
     
-    check_count = 0
+    stats = {'check_count': 0}
     start_time = time.time()
     
+    try:
+        asyncio.run(_monitor_multiple_channels_loop(monitors, channel_ids, max_videos, poll_interval, stats, start_time))
+    except KeyboardInterrupt:
+        elapsed = time.time() - start_time
+        print(f"\n⏹️ Monitoring stopped after {stats['check_count']} checks ({elapsed:.0f} seconds)")
+        print("💾 Cache saved for next run")
+
+
+async def _monitor_multiple_channels_loop(monitors: dict, channel_ids: list, max_videos: int, poll_interval: float, stats: dict, start_time: float):
+    """
+    Check all channels concurrently, one cycle after another.
+    
+    get_new_videos is a blocking scrapetube call, so each channel runs in a
+    worker thread and a cycle takes as long as the slowest channel rather
+    than the sum of all of them.
+    """
+    errors = 0
+    # Show status roughly every 30 seconds
+    status_every = max(1, int(30 / poll_interval))
+    
+    # At least 4 workers, one per channel above that; created once and reused by every cycle
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=max(4, len(channel_ids)), thread_name_prefix='yt-mon')
+    
     try:
         while True:
-            check_count += 1
-            current_time = datetime.now().strftime("%H:%M:%S")
+            stats['check_count'] += 1
+            check_count = stats['check_count']
             total_new_videos = 0
             
-            # Check each channel
-            for channel_id in channel_ids:
-                monitor = monitors[channel_id]
-                new_videos = monitor.get_new_videos(channel_id, max_videos)
-                
-                if new_videos:
+            # Check every channel at once
+            results = await asyncio.gather(*[
+                loop.run_in_executor(pool, monitors[channel_id].get_new_videos, channel_id, max_videos)
+                for channel_id in channel_ids
+            ], return_exceptions=True)
+            
+            failed = 0
+            for channel_id, new_videos in zip(channel_ids, results):
+                if isinstance(new_videos, Exception):
+                    failed += 1
+                    print(f"❌ [{time.strftime('%H:%M:%S')}] Channel {channel_id}: check failed ({new_videos})")
+                elif new_videos:
                     total_new_videos += len(new_videos)
-                    print(f"\n🎉 [{current_time}] Channel {channel_id}: {len(new_videos)} new videos!")
+                    print(f"\n🎉 [{time.strftime('%H:%M:%S')}] Channel {channel_id}: {len(new_videos)} new videos!")
                     for video in new_videos:
                         print(f"  📺 {video['title']}")
                         print(f"  🔗 {video['url']}")
             
             # Show status every 30 seconds
-            if check_count % 30 == 0:
+            if check_count % status_every == 0:
                 elapsed = time.time() - start_time
-                print(f"[{current_time}] Check #{check_count} ({elapsed:.0f}s elapsed): {total_new_videos} total new videos")
+                print(f"[{time.strftime('%H:%M:%S')}] Check #{check_count} ({elapsed:.0f}s elapsed): {total_new_videos} total new videos")
             
-            # No wait - maximum speed
-            # Continuous monitoring with no delays
-            
-    except KeyboardInterrupt:
-        elapsed = time.time() - start_time
-        print(f"\n⏹️ Monitoring stopped after {check_count} checks ({elapsed:.0f} seconds)")
-        print("💾 Cache saved for next run")
+            # Back off only when every channel failed (likely throttled or offline)
+            if failed == len(channel_ids):
+                errors += 1
+                await asyncio.sleep(_backoff_delay(poll_interval, errors))
+            else:
+                errors = 0
+                await asyncio.sleep(poll_interval)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 def main():
@@ -126,14 +179,15 @@ def main():
         "UCnyrsGaLYX2GEALD_FzxdIA",  # Your channel
     ]
     MAX_VIDEOS = 5  # Number of videos to check per cycle
+    POLL_INTERVAL = 1.0  # Seconds to wait between checks
     
     if len(sys.argv) > 1:
         mode = sys.argv[1].lower()
         
         if mode == "single":
-            monitor_channel_realtime(CHANNEL_ID, MAX_VIDEOS)
+            monitor_channel_realtime(CHANNEL_ID, MAX_VIDEOS, POLL_INTERVAL)
         elif mode == "multi":
-            monitor_multiple_channels_realtime(CHANNEL_IDS, MAX_VIDEOS)
+            monitor_multiple_channels_realtime(CHANNEL_IDS, MAX_VIDEOS, POLL_INTERVAL)
         else:
             print("Usage:")
             print("  python realtime_monitor.py single  - Monitor one channel")
@@ -143,7 +197,7 @@ def main():
         print("🚀 Starting real-time monitoring...")
         print("💡 Tip: Use 'python realtime_monitor.py multi' for multiple channels")
         print()
-        monitor_channel_realtime(CHANNEL_ID, MAX_VIDEOS)
+        monitor_channel_realtime(CHANNEL_ID, MAX_VIDEOS, POLL_INTERVAL)
 
 
 if __name__ == "__main__":
@@ -6,79 +6,358 @@ Optimized for 20-30 second maximum response time.
 
 import sys
 import time
-import threading
 import asyncio
-import concurrent.futures
+import re
+import json
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from test_scrapetube_fetch import YouTubeChannelMonitor
-import scrapetube
+import aiohttp
+
+WATCH_URL = "https://www.youtube.com/watch?v="
+# Atom feed with a channel's 15 most recent uploads (~10 KB instead of the full channel page)
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+FEED_NAMESPACES = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+}
+# InnerTube endpoint the YouTube web client (and scrapetube) uses for channel pages
+BROWSE_URL = "https://www.youtube.com/youtubei/v1/browse?prettyPrint=false"
+# Channel page whose ytcfg holds the InnerTube API key and current client version
+CHANNEL_VIDEOS_URL = "https://www.youtube.com/channel/{channel_id}/videos"
+YTCFG_PATTERNS = {
+    'api_key': re.compile(r'"INNERTUBE_API_KEY"\s*:\s*"([^"]+)"'),
+    'client_version': re.compile(r'"INNERTUBE_CLIENT_VERSION"\s*:\s*"([^"]+)"'),
+}
+# Selects the channel's "Videos" tab, newest first
+VIDEOS_TAB_PARAMS = "EgZ2aWRlb3PyBgQKAjoA"
+WEB_CLIENT_CONTEXT = {
+    "client": {
+        "clientName": "WEB",
+        "clientVersion": "2.20240101.00.00",
+        "hl": "en",
+        "gl": "US",
+    }
+}
+# Sent with every request; set once on the session instead of per call
+SESSION_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Origin": "https://www.youtube.com",
+}
+
+def _search_dict(partial, search_key: str):
+    """Yield every value stored under search_key anywhere in a nested JSON structure (like scrapetube)"""
+    stack = [partial]
+    while stack:
+        current_item = stack.pop(0)
+        if isinstance(current_item, dict):
+            for key, value in current_item.items():
+                if key == search_key:
+                    yield value
+                else:
+                    stack.append(value)
+        elif isinstance(current_item, list):
+            stack.extend(current_item)
 
 class FastYouTubeMonitor:
     """Ultra-fast YouTube monitor with aggressive optimization."""
     
     def __init__(self, cache_file: str = "fast_monitor_cache.json"):
         self.cache_file = cache_file
-        self.processed_videos = set()
+        # video_id -> last time it was seen, oldest first (bounded LRU)
+        self.processed_videos = OrderedDict()
+        self.max_processed_videos = 4096
+        self.processed_ttl = 86400  # Forget IDs not seen in the feed for a day
         self.last_check_times = {}
+        # cache_key -> videos; entries past hard_ttl are purged by one background sweep
         self.video_cache = {}
-        self.cache_duration = 15  # Cache for 15 seconds (very aggressive)
-        self.max_workers = 3  # Parallel workers
+        self._expiry = {}  # cache_key -> time.monotonic() hard deadline
+        self._stale_at = {}  # cache_key -> time.monotonic() soft deadline
+        # cache_key -> (videos, etag, last_modified), kept past expiry for conditional requests
+        self.feed_validators = OrderedDict()
+        self.max_cached_channels = 256
+        self.soft_ttl = 10  # Serve cached videos as-is for 10 seconds
+        self.hard_ttl = 60  # Serve stale videos while refreshing for up to 60 seconds
+        self.sweep_interval = self.hard_ttl / 3
+        self._sweeper = None
+        self._in_flight = set()  # cache_keys with a refresh running
+        self._refresh_tasks = set()  # background refreshes, kept referenced until done
+        self.session = None  # aiohttp session, created on first use inside the event loop
+        # channel_id -> {'api_key', 'client_version'} scraped from ytcfg, valid for hours
+        self._browse_ctx = {}
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, keeping connections to YouTube warm between polls"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=32, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=SESSION_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self.session
+    
+    async def close(self):
+        """Stop the cache sweep and close the HTTP session."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+    
+    def _ensure_sweeper(self):
+        """Start the background cache sweep (needs a running event loop)."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_cache())
+    
+    async def _sweep_cache(self):
+        """Purge expired video_cache entries in bulk so lookups need no time checks."""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            now = time.monotonic()
+            for cache_key, expires_at in list(self._expiry.items()):
+                if expires_at <= now:
+                    del self._expiry[cache_key]
+                    self.video_cache.pop(cache_key, None)
+                    self._stale_at.pop(cache_key, None)
+    
+    async def _request(self, method: str, url: str, **kwargs) -> tuple:
+        """
+        Send a request, raising on HTTP errors other than 304 Not Modified.
         
-    def get_channel_videos_fast(self, channel_id: str, limit: int = 3) -> list:
+        Returns:
+            Tuple of (status, response headers, body)
         """
-        Ultra-fast video fetching with aggressive caching.
-        Only checks latest 3 videos by default for speed.
+        session = await self._get_session()
+        # One quick retry when a pooled keep-alive connection was dropped by the server
+        for attempt in range(2):
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status != 304:
+                        response.raise_for_status()
+                    return response.status, response.headers, await response.read()
+            except aiohttp.ClientConnectionError:
+                if attempt:
+                    raise
+                await asyncio.sleep(0.1)
+    
+    async def _fetch_feed(self, channel_id: str, limit: int, etag: str = None, last_modified: str = None) -> tuple:
         """
-        current_time = time.time()
-        cache_key = f"{channel_id}_{limit}"
+        Fetch the latest uploads of a channel from its RSS (Atom) feed.
         
-        # Check cache first (very aggressive caching)
-        if cache_key in self.video_cache:
-            cache_time, videos = self.video_cache[cache_key]
-            if current_time - cache_time < self.cache_duration:
-                return videos
+        Sends the validators from the previous response, so an unchanged feed
+        comes back as an empty 304.
         
-        try:
-            # Fetch only the latest videos (minimal data)
-            videos = scrapetube.get_channel(channel_id, limit=limit)
+        Returns:
+            Tuple of (video list or None if not modified, etag, last_modified)
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        status, response_headers, body = await self._request("GET", FEED_URL.format(channel_id=channel_id), headers=headers)
+        if status == 304:
+            return None, etag, last_modified
+        
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        root = ET.fromstring(body)
+        
+        video_list = []
+        fetched_at = datetime.now().isoformat()
+        for entry in root.findall("atom:entry", FEED_NAMESPACES)[:limit]:
+            video_id = entry.findtext("yt:videoId", namespaces=FEED_NAMESPACES)
+            video_data = {
+                'id': video_id,
+                'title': entry.findtext("atom:title", 'Unknown Title', FEED_NAMESPACES),
+                'url': WATCH_URL + video_id if video_id else WATCH_URL,
+                'published': entry.findtext("atom:published", 'Unknown', FEED_NAMESPACES),
+                'fetched_at': fetched_at
+            }
+            video_list.append(video_data)
+        return video_list, etag, last_modified
+    
+    async def _resolve_browse(self, channel_id: str) -> dict:
+        """
+        Scrape the InnerTube API key and client version from a channel page once.
+        
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            dict: Browse context for the channel (empty values if ytcfg was not found)
+        """
+        ctx = self._browse_ctx.get(channel_id)
+        if ctx is None:
+            try:
+                _, _, body = await self._request("GET", CHANNEL_VIDEOS_URL.format(channel_id=channel_id))
+                html = body.decode('utf-8', errors='replace')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Browse still works with the built-in client context (a ClientTimeout raises TimeoutError)
+                print(f"⚠️ Could not read ytcfg for {channel_id} ({e}), using default client context")
+                html = ''
+            ctx = {}
+            for name, pattern in YTCFG_PATTERNS.items():
+                match = pattern.search(html)
+                ctx[name] = match.group(1) if match else None
+            self._browse_ctx[channel_id] = ctx
+        return ctx
+    
+    async def _fetch_browse(self, channel_id: str, limit: int) -> list:
+        """Fetch the latest uploads of a channel straight from YouTube's browse endpoint."""
+        # Resolve the channel's ytcfg once; re-resolve only when YouTube rejects it
+        for attempt in range(2):
+            ctx = await self._resolve_browse(channel_id)
+            url = BROWSE_URL
+            context = WEB_CLIENT_CONTEXT
+            if ctx['api_key']:
+                url = f"{BROWSE_URL}&key={ctx['api_key']}"
+            if ctx['client_version']:
+                context = {"client": {**WEB_CLIENT_CONTEXT["client"], "clientVersion": ctx['client_version']}}
+            payload = {
+                "context": context,
+                "browseId": channel_id,
+                "params": VIDEOS_TAB_PARAMS,
+            }
+            try:
+                _, _, body = await self._request("POST", url, json=payload)
+                break
+            except aiohttp.ClientResponseError as e:
+                if attempt or e.status not in (400, 403):
+                    raise
+                self._browse_ctx.pop(channel_id, None)
+        
+        data = json.loads(body)
+        
+        video_list = []
+        fetched_at = datetime.now().isoformat()
+        for video in _search_dict(data, "videoRenderer"):
+            video_id = video.get('videoId')
+            # Index directly; the fallbacks are only built when a field is missing
+            try:
+                title = video['title']['runs'][0]['text']
+            except (KeyError, IndexError, TypeError):
+                title = 'Unknown Title'
+            try:
+                published = video['publishedTimeText']['simpleText']
+            except (KeyError, TypeError):
+                published = 'Unknown'
+            video_data = {
+                'id': video_id,
+                'title': title,
+                'url': WATCH_URL + video_id if video_id else WATCH_URL,
+                'published': published,
+                'fetched_at': fetched_at
+            }
+            video_list.append(video_data)
+            if len(video_list) >= limit:
+                break
+        return video_list
+        
+    async def _refresh(self, channel_id: str, limit: int) -> list:
+        """
+        Fetch the latest videos for a channel and store them in the cache.
+        
+        Args:
+            channel_id: YouTube channel ID
+            limit: Number of videos to fetch
             
-            video_list = []
-            for video in videos:
-                video_data = {
-                    'id': video.get('videoId'),
-                    'title': video.get('title', {}).get('runs', [{}])[0].get('text', 'Unknown Title'),
-                    'url': f"https://www.youtube.com/watch?v={video.get('videoId')}",
-                    'published': video.get('publishedTimeText', {}).get('simpleText', 'Unknown'),
-                    'fetched_at': datetime.now().isoformat()
-                }
-                video_list.append(video_data)
+        Returns:
+            list: Latest videos, or [] if the fetch failed
+        """
+        cache_key = f"{channel_id}_{limit}"
+        self._in_flight.add(cache_key)
+        self._ensure_sweeper()
+        videos, etag, last_modified = self.feed_validators.get(cache_key, (None, None, None))
+        
+        try:
+            # Fetch only the latest videos (minimal data) from the RSS feed
+            try:
+                video_list, etag, last_modified = await self._fetch_feed(channel_id, limit, etag, last_modified)
+                if video_list is None:
+                    # 304 Not Modified: the cached list is still current
+                    video_list = videos
+            except (aiohttp.ClientError, asyncio.TimeoutError, ET.ParseError) as e:
+                # Feed unavailable, timed out or malformed, fall back to the browse endpoint
+                print(f"⚠️ RSS feed failed for {channel_id} ({e}), using browse endpoint")
+                video_list = await self._fetch_browse(channel_id, limit)
+                etag, last_modified = None, None
             
-            # Cache the results
-            self.video_cache[cache_key] = (current_time, video_list)
+            # Cache the results, and keep the feed validators for the next request
+            now = time.monotonic()
+            self.video_cache[cache_key] = video_list
+            self._stale_at[cache_key] = now + self.soft_ttl
+            self._expiry[cache_key] = now + self.hard_ttl
+            self.feed_validators[cache_key] = (video_list, etag, last_modified)
+            self.feed_validators.move_to_end(cache_key)
+            while len(self.feed_validators) > self.max_cached_channels:
+                self.feed_validators.popitem(last=False)
             
             return video_list
             
         except Exception as e:
             print(f"Error fetching videos from {channel_id}: {e}")
             return []
+        finally:
+            self._in_flight.discard(cache_key)
     
-    def get_new_videos_fast(self, channel_id: str, limit: int = 3) -> list:
+    async def get_channel_videos_fast(self, channel_id: str, limit: int = 3) -> list:
+        """
+        Ultra-fast video fetching with aggressive caching.
+        Only checks latest 3 videos by default for speed.
+        
+        Cached videos older than soft_ttl are still returned immediately while a
+        background refresh runs (stale-while-revalidate); the caller only waits on
+        the network when nothing younger than hard_ttl is cached.
+        """
+        cache_key = f"{channel_id}_{limit}"
+        
+        videos = self.video_cache.get(cache_key)
+        if videos is not None:
+            if time.monotonic() >= self._stale_at[cache_key] and cache_key not in self._in_flight:
+                task = asyncio.get_running_loop().create_task(self._refresh(channel_id, limit))
+                self._in_flight.add(cache_key)
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return videos
+        
+        return await self._refresh(channel_id, limit)
+    
+    async def get_new_videos_fast(self, channel_id: str, limit: int = 3) -> list:
         """
         Ultra-fast new video detection.
         Only checks latest 3 videos for maximum speed.
         """
-        videos = self.get_channel_videos_fast(channel_id, limit)
-        new_videos = []
+        videos = await self.get_channel_videos_fast(channel_id, limit)
+        processed = self.processed_videos
+        now = time.monotonic()
+        
+        new_videos = [video for video in videos if video['id'] and video['id'] not in processed]
         
-        for video in videos:
-            video_id = video['id']
-            if video_id and video_id not in self.processed_videos:
-                new_videos.append(video)
-                self.processed_videos.add(video_id)
+        # Refresh on every sighting so IDs still listed in the feed never expire
+        seen_ids = [video['id'] for video in videos if video['id']]
+        processed.update(dict.fromkeys(seen_ids, now))
+        for video_id in seen_ids:
+            processed.move_to_end(video_id)
         
+        self._evict_processed_videos(now)
         return new_videos
+    
+    def _evict_processed_videos(self, now: float):
+        """Drop the oldest seen IDs once over the size cap or past the TTL."""
+        while self.processed_videos:
+            video_id, seen_at = next(iter(self.processed_videos.items()))
+            if len(self.processed_videos) <= self.max_processed_videos and now - seen_at < self.processed_ttl:
+                break
+            self.processed_videos.popitem(last=False)
 
-def monitor_channel_ultra_fast(channel_id: str, max_videos: int = 3):
+def monitor_channel_ultra_fast(channel_id: str, max_videos: int = 3, poll_interval: float = 1.0):
     """
     Ultra-fast single channel monitoring.
     Optimized for 20-30 second maximum response time.
@@ -86,56 +365,66 @@ def monitor_channel_ultra_fast(channel_id: str, max_videos: int = 3):
     print(f"🚀 Ultra-fast monitoring started!")
     print(f"📺 Channel: {channel_id}")
     print(f"⚡ Target: 20-30 second maximum response time")
-    print(f"🔍 Checking latest {max_videos} videos per cycle")
+    print(f"🔍 Checking latest {max_videos} videos every {poll_interval:g}s")
     print("Press Ctrl+C to stop")
     print("="*60)
     
     monitor = FastYouTubeMonitor(f"ultra_fast_{channel_id}.json")
-    check_count = 0
+    stats = {'check_count': 0}
     start_time = time.time()
     
+    async def run():
+        try:
+            while True:
+                cycle_start = time.time()
+                stats['check_count'] += 1
+                check_count = stats['check_count']
+                
+                # Get new videos (ultra-fast)
+                new_videos = await monitor.get_new_videos_fast(channel_id, max_videos)
+                
+                cycle_time = time.time() - cycle_start
+                
+                # Build the cycle's output and write it in one call
+                lines = []
+                if new_videos:
+                    lines.append(f"\n🎉 [{time.strftime('%H:%M:%S')}] Found {len(new_videos)} new videos! (Cycle: {cycle_time:.1f}s)")
+                    for video in new_videos:
+                        lines.append(f"📺 {video['title']}")
+                        lines.append(f"🔗 {video['url']}")
+                        lines.append(f"📅 {video['published']}")
+                        lines.append("-" * 40)
+                else:
+                    # Show status every 10 checks
+                    if check_count % 10 == 0:
+                        elapsed = time.time() - start_time
+                        lines.append(f"[{time.strftime('%H:%M:%S')}] Check #{check_count} (Cycle: {cycle_time:.1f}s, Total: {elapsed:.0f}s): No new videos")
+                if lines:
+                    sys.stdout.write('\n'.join(lines) + '\n')
+                    if new_videos:
+                        sys.stdout.flush()
+                
+                await asyncio.sleep(poll_interval)
+        finally:
+            await monitor.close()
+    
     try:
-        while True:
-            cycle_start = time.time()
-            check_count += 1
-            current_time = datetime.now().strftime("%H:%M:%S")
-            
-            # Get new videos (ultra-fast)
-            new_videos = monitor.get_new_videos_fast(channel_id, max_videos)
-            
-            cycle_time = time.time() - cycle_start
-            
-            if new_videos:
-                print(f"\n🎉 [{current_time}] Found {len(new_videos)} new videos! (Cycle: {cycle_time:.1f}s)")
-                for video in new_videos:
-                    print(f"📺 {video['title']}")
-                    print(f"🔗 {video['url']}")
-                    print(f"📅 {video['published']}")
-                    print("-" * 40)
-            else:
-                # Show status every 10 seconds (more frequent updates)
-                if check_count % 10 == 0:
-                    elapsed = time.time() - start_time
-                    print(f"[{current_time}] Check #{check_count} (Cycle: {cycle_time:.1f}s, Total: {elapsed:.0f}s): No new videos")
-            
-            # No sleep - maximum speed
-            # Ultra-aggressive: continuous monitoring with no delays
-            
+        asyncio.run(run())
     except KeyboardInterrupt:
         elapsed = time.time() - start_time
-        print(f"\n⏹️ Monitoring stopped after {check_count} checks ({elapsed:.0f} seconds)")
+        print(f"\n⏹️ Monitoring stopped after {stats['check_count']} checks ({elapsed:.0f} seconds)")
         print("💾 Cache saved for next run")
 
-def monitor_multiple_channels_ultra_fast(channel_ids: list, max_videos: int = 2):
+def monitor_multiple_channels_ultra_fast(channel_ids: list, max_videos: int = 2, poll_interval: float = 1.0):
     """
-    Ultra-fast multi-channel monitoring with parallel processing.
+    Ultra-fast multi-channel monitoring with all channels checked concurrently.
     """
     print(f"🚀 Ultra-fast multi-channel monitoring started!")
     print(f"📺 Channels: {len(channel_ids)}")
     for i, channel in enumerate(channel_ids, 1):
         print(f"  {i}. {channel}")
     print(f"⚡ Target: 20-30 second maximum response time")
-    print(f"🔍 Checking latest {max_videos} videos per channel")
+    print(f"🔍 Checking latest {max_videos} videos per channel every {poll_interval:g}s")
     print("Press Ctrl+C to stop")
     print("="*60)
     
@@ -143,94 +432,110 @@ def monitor_multiple_channels_ultra_fast(channel_ids: list, max_videos: int = 2)
     for channel_id in channel_ids:
         monitors[channel_id] = FastYouTubeMonitor(f"ultra_fast_{channel_id}.json")
     
-    check_count = 0
+    stats = {'check_count': 0}
     start_time = time.time()
     
-    def check_channel_fast(channel_id):
-        """Check a single channel quickly"""
-        monitor = monitors[channel_id]
-        return channel_id, monitor.get_new_videos_fast(channel_id, max_videos)
-    
-    try:
-        while True:
-            cycle_start = time.time()
-            check_count += 1
-            current_time = datetime.now().strftime("%H:%M:%S")
-            total_new_videos = 0
-            
-            # Parallel processing for multiple channels
-            with concurrent.futures.ThreadPoolExecutor(max_workers=len(channel_ids)) as executor:
-                futures = {executor.submit(check_channel_fast, channel_id): channel_id for channel_id in channel_ids}
+    async def run():
+        try:
+            while True:
+                cycle_start = time.time()
+                stats['check_count'] += 1
+                check_count = stats['check_count']
+                total_new_videos = 0
                 
-                for future in concurrent.futures.as_completed(futures):
-                    channel_id, new_videos = future.result()
-                    
+                # All channels in one round of concurrent requests; cycle time is the slowest channel
+                results = await asyncio.gather(*[
+                    monitors[channel_id].get_new_videos_fast(channel_id, max_videos)
+                    for channel_id in channel_ids
+                ])
+                
+                # Build the cycle's output and write it in one call
+                lines = []
+                for channel_id, new_videos in zip(channel_ids, results):
                     if new_videos:
                         total_new_videos += len(new_videos)
-                        print(f"\n🎉 [{current_time}] Channel {channel_id}: {len(new_videos)} new videos!")
+                        lines.append(f"\n🎉 [{time.strftime('%H:%M:%S')}] Channel {channel_id}: {len(new_videos)} new videos!")
                         for video in new_videos:
-                            print(f"  📺 {video['title']}")
-                            print(f"  🔗 {video['url']}")
-            
-            cycle_time = time.time() - cycle_start
-            
-            # Show status every 10 seconds
-            if check_count % 10 == 0:
-                elapsed = time.time() - start_time
-                print(f"[{current_time}] Check #{check_count} (Cycle: {cycle_time:.1f}s, Total: {elapsed:.0f}s): {total_new_videos} total new videos")
-            
-            # No sleep - maximum speed
-            # Ultra-aggressive: continuous monitoring with no delays
-            
+                            lines.append(f"  📺 {video['title']}")
+                            lines.append(f"  🔗 {video['url']}")
+                
+                cycle_time = time.time() - cycle_start
+                
+                # Show status every 10 checks
+                if check_count % 10 == 0:
+                    elapsed = time.time() - start_time
+                    lines.append(f"[{time.strftime('%H:%M:%S')}] Check #{check_count} (Cycle: {cycle_time:.1f}s, Total: {elapsed:.0f}s): {total_new_videos} total new videos")
+                if lines:
+                    sys.stdout.write('\n'.join(lines) + '\n')
+                    if total_new_videos:
+                        sys.stdout.flush()
+                
+                await asyncio.sleep(poll_interval)
+        finally:
+            for monitor in monitors.values():
+                await monitor.close()
+    
+    try:
+        asyncio.run(run())
     except KeyboardInterrupt:
         elapsed = time.time() - start_time
-        print(f"\n⏹️ Monitoring stopped after {check_count} checks ({elapsed:.0f} seconds)")
+        print(f"\n⏹️ Monitoring stopped after {stats['check_count']} checks ({elapsed:.0f} seconds)")
         print("💾 Cache saved for next run")
 
-def monitor_channel_aggressive(channel_id: str, max_videos: int = 2):
+def monitor_channel_aggressive(channel_id: str, max_videos: int = 2, poll_interval: float = 0.5):
     """
     Most aggressive monitoring - checks every 0.5 seconds with minimal data.
     """
     print(f"🚀 AGGRESSIVE monitoring started!")
     print(f"📺 Channel: {channel_id}")
     print(f"⚡ Target: 10-15 second maximum response time")
-    print(f"🔍 Checking latest {max_videos} videos every 0.5 seconds")
+    print(f"🔍 Checking latest {max_videos} videos every {poll_interval:g} seconds")
     print("Press Ctrl+C to stop")
     print("="*60)
     
     monitor = FastYouTubeMonitor(f"aggressive_{channel_id}.json")
-    check_count = 0
+    stats = {'check_count': 0}
     start_time = time.time()
     
+    async def run():
+        try:
+            while True:
+                cycle_start = time.time()
+                stats['check_count'] += 1
+                check_count = stats['check_count']
+                
+                # Get new videos (minimal data)
+                new_videos = await monitor.get_new_videos_fast(channel_id, max_videos)
+                
+                cycle_time = time.time() - cycle_start
+                
+                # Build the cycle's output and write it in one call
+                lines = []
+                if new_videos:
+                    lines.append(f"\n🎉 [{time.strftime('%H:%M:%S')}] Found {len(new_videos)} new videos! (Cycle: {cycle_time:.1f}s)")
+                    for video in new_videos:
+                        lines.append(f"📺 {video['title']}")
+                        lines.append(f"🔗 {video['url']}")
+                        lines.append("-" * 30)
+                else:
+                    # Show status every 10 checks
+                    if check_count % 10 == 0:
+                        elapsed = time.time() - start_time
+                        lines.append(f"[{time.strftime('%H:%M:%S')}] Check #{check_count} (Cycle: {cycle_time:.1f}s, Total: {elapsed:.0f}s): No new videos")
+                if lines:
+                    sys.stdout.write('\n'.join(lines) + '\n')
+                    if new_videos:
+                        sys.stdout.flush()
+                
+                await asyncio.sleep(poll_interval)
+        finally:
+            await monitor.close()
+    
     try:
-        while True:
-            cycle_start = time.time()
-            check_count += 1
-            current_time = datetime.now().strftime("%H:%M:%S")
-            
-            # Get new videos (minimal data)
-            new_videos = monitor.get_new_videos_fast(channel_id, max_videos)
-            
-            cycle_time = time.time() - cycle_start
-            
-            if new_videos:
-                print(f"\n🎉 [{current_time}] Found {len(new_videos)} new videos! (Cycle: {cycle_time:.1f}s)")
-                for video in new_videos:
-                    print(f"📺 {video['title']}")
-                    print(f"🔗 {video['url']}")
-                    print("-" * 30)
-            else:
-                # Show status every 5 seconds
-                if check_count % 10 == 0:
-                    elapsed = time.time() - start_time
-                    print(f"[{current_time}] Check #{check_count} (Cycle: {cycle_time:.1f}s, Total: {elapsed:.0f}s): No new videos")
-            
-            # No sleep - maximum speed
-            # Ultra-aggressive: continuous monitoring with no delays
-            
+        asyncio.run(run())
     except KeyboardInterrupt:
         elapsed = time.time() - start_time
-        print(f"\n⏹️ Monitoring stopped after {check_count} checks ({elapsed:.0f} seconds)")
+        print(f"\n⏹️ Monitoring stopped after {stats['check_count']} checks ({elapsed:.0f} seconds)")
         print("💾 Cache saved for next run")
 
 def main():
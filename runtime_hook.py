@@ -1,10 +1,15 @@
 # Runtime hook for executable-specific fixes
 import os
 import sys
+import shutil
+import functools
 
+FROZEN = getattr(sys, 'frozen', False)
+
+@functools.cache
 def fix_executable_paths():
     """Fix paths when running in executable mode"""
-    if getattr(sys, 'frozen', False):
+    if FROZEN:
         # Running in executable mode
         base_path = os.path.dirname(sys.executable)
         
@@ -22,9 +27,10 @@ def fix_executable_paths():
             if not os.path.exists(dir_path):
                 os.makedirs(dir_path, exist_ok=True)
 
+@functools.cache
 def fix_chrome_automation():
     """Fix Chrome automation issues in executable mode"""
-    if getattr(sys, 'frozen', False):
+    if FROZEN:
         # Set environment variables for Chrome
         os.environ['CHROME_NO_SANDBOX'] = '1'
         os.environ['CHROME_DISABLE_DEV_SHM_USAGE'] = '1'
@@ -35,13 +41,15 @@ def fix_chrome_automation():
             r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
         ]
         
-        for chrome_path in chrome_paths:
-            if os.path.exists(chrome_path):
-                chrome_dir = os.path.dirname(chrome_path)
-                if chrome_dir not in os.environ.get('PATH', ''):
-                    current_path = os.environ.get('PATH', '')
-                    os.environ['PATH'] = f"{chrome_dir};{current_path}"
-                break
+        if shutil.which('chrome'):
+            return  # Already on PATH
+        
+        chrome_path = next((p for p in chrome_paths if os.path.exists(p)), None)
+        if chrome_path:
+            chrome_dir = os.path.dirname(chrome_path)
+            current_path = os.environ.get('PATH', '')
+            if chrome_dir not in current_path.split(os.pathsep):
+                os.environ['PATH'] = f"{chrome_dir}{os.pathsep}{current_path}"
 
 # Apply fixes
 fix_executable_paths()
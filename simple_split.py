@@ -6,7 +6,68 @@ Simple and fast video splitting without external dependencies
 import os
 import shutil
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl that makes a file share all blocks of another (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+# Copies running at once; more than this rarely helps a single disk
+MAX_COPY_WORKERS = 4
+
+def _clone_or_copy_range(src_fd: int, dst_fd: int) -> bool:
+    """
+    Copy src_fd into dst_fd inside the kernel, without reading the data into Python.
+    
+    Args:
+        src_fd: File descriptor open for reading
+        dst_fd: Empty file descriptor open for writing
+    
+    Returns:
+        True if the data was copied, False if the caller should fall back to a normal copy
+    """
+    if fcntl is not None:
+        try:
+            # Reflink: no data is written at all
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return True
+        except OSError:
+            pass
+    
+    if hasattr(os, 'copy_file_range'):
+        size = os.fstat(src_fd).st_size
+        copied = 0
+        try:
+            while copied < size:
+                n = os.copy_file_range(src_fd, dst_fd, size - copied, copied, copied)
+                if n == 0:
+                    break
+                copied += n
+            # A short copy (e.g. the source shrank) falls back rather than leaving a truncated file
+            return copied == size
+        except OSError:
+            pass
+    
+    return False
+
+def _fast_clone(src: str, dst: str):
+    """
+    Copy a file as cheaply as the platform allows: reflink, then copy_file_range,
+    then shutil.copyfile. File metadata such as mtime is not copied.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if _clone_or_copy_range(fsrc.fileno(), fdst.fileno()):
+            return
+    shutil.copyfile(src, dst)
 
 def simple_split_video(video_path: str, num_parts: int = 3, output_dir: str = None) -> List[str]:
     """
@@ -36,24 +97,30 @@ def simple_split_video(video_path: str, num_parts: int = 3, output_dir: str = No
     print(f"🚀 SIMPLE splitting video into {num_parts} parts")
     print(f"📁 Output directory: {output_dir}")
     
-    for i in range(num_parts):
+    def create_part(i: int) -> Optional[str]:
         output_file = os.path.join(output_dir, f"{base_name}_part_{i+1}.mp4")
         
         print(f"⚡ Creating part {i+1}/{num_parts}...")
         
         try:
-            # Simply copy the file - this is INSTANT!
-            shutil.copy2(video_path, output_file)
+            # Simply copy the file - this is INSTANT on filesystems with reflinks!
+            _fast_clone(video_path, output_file)
             
             if os.path.exists(output_file):
                 file_size = os.path.getsize(output_file)
                 print(f"✅ Part {i+1} created: {file_size} bytes")
-                output_files.append(output_file)
+                return output_file
             else:
                 print(f"❌ Failed to create part {i+1}")
                 
         except Exception as e:
             print(f"❌ Error creating part {i+1}: {e}")
+        return None
+    
+    # Overlap the copies when the filesystem has to write real bytes
+    if num_parts > 0:
+        with ThreadPoolExecutor(max_workers=min(num_parts, MAX_COPY_WORKERS)) as executor:
+            output_files = [f for f in executor.map(create_part, range(num_parts)) if f]
     
     print(f"🎉 Simple splitting completed: {len(output_files)} parts created")
     return output_files
@@ -5,28 +5,100 @@ Automatically chooses the best quality and download method based on connection s
 """
 
 import os
+import json
 import time
-import speedtest
+import bisect
+import shutil
 import requests
 from datetime import datetime
 from pytube import YouTube
 import yt_dlp
 
+# Reuse a speed measurement for 10 minutes, across runs via a small JSON file
+SPEED_CACHE_TTL = 600
+SPEED_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".smart_download_speed.json")
+_SPEED_CACHE = None  # (time.monotonic() of measurement, mbps)
+
+# aria2c replaces yt-dlp's own fragment downloader when it is installed
+_HAS_ARIA2 = shutil.which('aria2c') is not None
+
+# 2 MB from Cloudflare's speed test CDN is enough to tell the quality buckets apart
+SPEED_TEST_URL = "https://speed.cloudflare.com/__down?bytes=2000000"
+
+# (minimum Mbps, quality, yt-dlp format filter), sorted by minimum speed
+QUALITY_TABLE = [
+    (0, "240p", "best[height<=240][filesize<10M]/best[height<=240]"),
+    (5, "360p", "best[height<=360][filesize<15M]/best[height<=360]"),
+    (10, "480p", "best[height<=480][filesize<20M]/best[height<=480]"),
+    (25, "720p", "best[height<=720][filesize<30M]/best[height<=720]"),
+    (50, "720p", "best[height<=720][filesize<50M]/best[height<=720]"),
+    (100, "1080p", "best[height<=1080][filesize<100M]/best[height<=1080]"),  # Ultra-fast connection
+]
+_QUALITY_THRESHOLDS = [row[0] for row in QUALITY_TABLE]
+
+# (minimum Mbps, downloader): pytube is more reliable for slower speeds, yt-dlp better for high speeds
+DOWNLOADER_TABLE = [
+    (0, "pytube"),
+    (20, "yt-dlp"),
+]
+_DOWNLOADER_THRESHOLDS = [row[0] for row in DOWNLOADER_TABLE]
+
 def log(message, level="info"):
     """Simple logging function"""
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] {message}")
 
-def test_internet_speed():
-    """Test internet speed and return Mbps"""
+def _get_cached_speed(max_age):
+    """Return a measured speed younger than max_age seconds, or None"""
+    global _SPEED_CACHE
+    if _SPEED_CACHE is not None:
+        measured_at, speed = _SPEED_CACHE
+        if time.monotonic() - measured_at < max_age:
+            return speed
+        return None
+    
+    # Fresh process: fall back to the measurement saved by a previous run
+    try:
+        with open(SPEED_CACHE_FILE, 'r') as f:
+            data = json.load(f)
+        age = time.time() - float(data['timestamp'])
+        speed = float(data['mbps'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if 0 <= age < max_age:
+        _SPEED_CACHE = (time.monotonic() - age, speed)
+        return speed
+    return None
+
+def _store_speed(speed):
+    """Remember a measured speed in memory and on disk"""
+    global _SPEED_CACHE
+    _SPEED_CACHE = (time.monotonic(), speed)
+    try:
+        with open(SPEED_CACHE_FILE, 'w') as f:
+            json.dump({'timestamp': time.time(), 'mbps': speed}, f)
+    except OSError as e:
+        log(f"⚠️ Could not save speed test result: {e}", "warning")
+
+def test_internet_speed(max_age=SPEED_CACHE_TTL):
+    """Test internet speed and return Mbps, reusing a result younger than max_age seconds"""
+    cached_speed = _get_cached_speed(max_age)
+    if cached_speed is not None:
+        log(f"📥 Download Speed: {cached_speed:.1f} Mbps (cached)", "info")
+        return cached_speed
+    
     try:
         log("🌐 Testing internet speed...", "info")
-        st = speedtest.Speedtest()
-        st.get_best_server()
+        start = time.monotonic()
+        with requests.get(SPEED_TEST_URL, stream=True, timeout=10) as response:
+            response.raise_for_status()
+            total_bytes = sum(len(chunk) for chunk in response.iter_content(65536))
+        elapsed = time.monotonic() - start
         
         # Test download speed
-        download_speed = st.download() / 1_000_000  # Convert to Mbps
+        download_speed = (total_bytes * 8 / 1_000_000) / elapsed  # Convert to Mbps
         log(f"📥 Download Speed: {download_speed:.1f} Mbps", "success")
+        _store_speed(download_speed)
         
         return download_speed
     except Exception as e:
@@ -36,25 +108,12 @@ def test_internet_speed():
 
 def get_optimal_quality(speed_mbps):
     """Determine optimal video quality based on internet speed"""
-    if speed_mbps >= 100:  # Ultra-fast connection
-        return "1080p", "best[height<=1080][filesize<100M]/best[height<=1080]"
-    elif speed_mbps >= 50:
-        return "720p", "best[height<=720][filesize<50M]/best[height<=720]"
-    elif speed_mbps >= 25:
-        return "720p", "best[height<=720][filesize<30M]/best[height<=720]"
-    elif speed_mbps >= 10:
-        return "480p", "best[height<=480][filesize<20M]/best[height<=480]"
-    elif speed_mbps >= 5:
-        return "360p", "best[height<=360][filesize<15M]/best[height<=360]"
-    else:
-        return "240p", "best[height<=240][filesize<10M]/best[height<=240]"
+    row = QUALITY_TABLE[max(0, bisect.bisect_right(_QUALITY_THRESHOLDS, speed_mbps) - 1)]
+    return row[1], row[2]
 
 def get_optimal_downloader(speed_mbps):
     """Choose the best downloader based on speed"""
-    if speed_mbps >= 20:
-        return "yt-dlp"  # Better for high speeds
-    else:
-        return "pytube"  # More reliable for slower speeds
+    return DOWNLOADER_TABLE[max(0, bisect.bisect_right(_DOWNLOADER_THRESHOLDS, speed_mbps) - 1)][1]
 
 def download_with_pytube(video_url, output_path, quality="720p"):
     """Download using pytube with quality selection"""
@@ -133,8 +192,17 @@ def download_with_pytube(video_url, output_path, quality="720p"):
         log(f"❌ pytube error: {str(e)}", "error")
         return False
 
-def download_with_ytdlp(video_url, output_path, quality_filter):
-    """Download using yt-dlp with quality selection"""
+def get_video_info(video_url):
+    """Fetch video metadata once with yt-dlp, without resolving formats or downloading"""
+    try:
+        with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, 'skip_download': True}) as ydl:
+            return ydl.extract_info(video_url, download=False, process=False)
+    except Exception as e:
+        log(f"⚠️ Failed to get video info: {str(e)}", "warning")
+        return None
+
+def download_with_ytdlp(video_url, output_path, quality_filter, info=None):
+    """Download using yt-dlp with quality selection, reusing already fetched info if given"""
     try:
         log("🚀 Using yt-dlp downloader...", "info")
         start_time = time.time()
@@ -153,22 +221,30 @@ def download_with_ytdlp(video_url, output_path, quality_filter):
             'socket_timeout': 10,  # Reduced for faster connections
             'retries': 1,  # Minimal retries
             'fragment_retries': 2,  # Minimal fragment retries
-            'concurrent_fragment_downloads': 32,  # Maximum parallel downloads
             'buffersize': 8192,  # Larger buffer for speed
             'nocheckcertificate': True,
             'no_check_certificate': True,
             'max_sleep_interval': 2,  # Maximum sleep interval
             'sleep_interval': 0.5,  # Minimal sleep interval
-            'external_downloader': 'aria2c',  # Use aria2c if available
-            'external_downloader_args': ['--max-connection-per-server=16', '--min-split-size=1M', '--split=16'],
         }
+        if _HAS_ARIA2:
+            # yt-dlp's fragment concurrency is unused with an external downloader
+            ydl_opts['external_downloader'] = 'aria2c'
+            ydl_opts['external_downloader_args'] = ['-x16', '-s16', '-k1M', '--file-allocation=none', '--console-log-level=warn']
+        else:
+            ydl_opts['concurrent_fragment_downloads'] = 16  # Parallel fragment downloads
+            ydl_opts['http_chunk_size'] = 10485760  # 10 MB ranged requests
         
         # Download
         log("📥 Downloading...", "info")
         download_start = time.time()
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([video_url])
+            if info:
+                # Metadata is already fetched, only pick formats and download
+                ydl.process_ie_result(info, download=True)
+            else:
+                ydl.download([video_url])
         
         download_time = time.time() - download_start
         total_time = time.time() - start_time
@@ -191,7 +267,7 @@ def download_with_ytdlp(video_url, output_path, quality_filter):
         log(f"❌ yt-dlp error: {str(e)}", "error")
         return False
 
-def smart_download(video_url, output_path):
+def smart_download(video_url, output_path, info=None):
     """Smart download that adapts to internet speed"""
     try:
         log("🧠 Starting smart download...", "info")
@@ -211,13 +287,13 @@ def smart_download(video_url, output_path):
         if downloader == "pytube":
             success = download_with_pytube(video_url, output_path, quality)
         else:
-            success = download_with_ytdlp(video_url, output_path, quality_filter)
+            success = download_with_ytdlp(video_url, output_path, quality_filter, info)
         
         # Fallback if primary method fails
         if not success:
             log("🔄 Primary method failed, trying fallback...", "warning")
             if downloader == "pytube":
-                success = download_with_ytdlp(video_url, output_path, "best")
+                success = download_with_ytdlp(video_url, output_path, "best", info)
             else:
                 success = download_with_pytube(video_url, output_path, "480p")
         
@@ -239,18 +315,18 @@ def main():
         log("❌ No URL provided", "error")
         return
     
-    # Generate output filename
-    try:
-        yt = YouTube(video_url)
-        safe_title = "".join(c for c in yt.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    # Generate output filename from metadata that the download reuses
+    info = get_video_info(video_url)
+    if info and info.get('title'):
+        safe_title = "".join(c for c in info['title'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
         output_path = f"smart_download_{safe_title}.mp4"
-    except:
+    else:
         output_path = "smart_download_video.mp4"
     
     # Start smart download
     log(f"🎯 Target: {output_path}", "info")
     
-    success = smart_download(video_url, output_path)
+    success = smart_download(video_url, output_path, info)
     
     if success:
         log("🎉 Download completed successfully!", "success")
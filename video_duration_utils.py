@@ -5,30 +5,46 @@ Handles video duration requirements and extensions
 """
 
 import os
+import bisect
+import shutil
 import subprocess
 import tempfile
-from typing import Tuple, Optional
-from moviepy.editor import VideoFileClip, concatenate_videoclips, ColorClip
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Tuple, Optional
+import ffmpeg_utils
+from ffmpeg_utils import (run_ffmpeg, output_size, get_h264_encoder, H264_ENCODERS, probe_duration, get_keyframes,
+                          parse_input_duration, parse_output_time)
 
+# (absolute path, mtime) -> keyframe timestamps, most recently used last
+_keyframe_cache = OrderedDict()
+_keyframe_cache_lock = threading.Lock()  # Splits run on several threads at once
+MAX_KEYFRAME_CACHE = 64
+
+@lru_cache(maxsize=1)
 def get_ffmpeg_path() -> str:
-    """Get the path to ffmpeg executable"""
+    """Get the path to ffmpeg executable (resolved once per process)"""
     # Try to find ffmpeg in the current directory first (bundled version)
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    ffmpeg_paths = [
-        os.path.join(current_dir, "ffmpeg.exe"),  # Windows
-        os.path.join(current_dir, "ffmpeg"),      # Linux/Mac
-        "ffmpeg"  # System PATH
-    ]
+    local_ffmpeg = os.path.join(current_dir, "ffmpeg.exe" if os.name == 'nt' else "ffmpeg")
+    if os.path.exists(local_ffmpeg):
+        return local_ffmpeg
     
-    for path in ffmpeg_paths:
-        if os.path.exists(path) or path == "ffmpeg":
-            return path
-    
-    return "ffmpeg"  # Fallback to system PATH
+    return shutil.which("ffmpeg") or "ffmpeg"  # Fallback to system PATH
+
+def get_ffprobe_path() -> str:
+    """Get the path to ffprobe executable (next to ffmpeg, or from PATH)"""
+    return ffmpeg_utils.get_ffprobe_path(get_ffmpeg_path())
 
 def get_video_duration(video_path: str) -> float:
     """
-    Get video duration in seconds using moviepy
+    Get video duration in seconds without decoding the video
+    
+    MP4/MOV durations are read straight from the container's mvhd atom, so
+    no subprocess is started; other files go through ffprobe (or the
+    "Duration:" line of "ffmpeg -i" when there is no ffprobe).
     
     Args:
         video_path: Path to the video file
@@ -36,14 +52,62 @@ def get_video_duration(video_path: str) -> float:
     Returns:
         Duration in seconds
     """
-    try:
-        video = VideoFileClip(video_path)
-        duration = video.duration
-        video.close()
-        return duration
-    except Exception as e:
-        print(f"❌ Failed to get video duration: {e}")
+    duration = probe_duration(video_path, get_ffmpeg_path())
+    if duration is None:
+        print(f"❌ Failed to get video duration: {video_path}")
         return 0.0
+    return duration
+
+def get_cached_keyframes(video_path: str) -> List[float]:
+    """
+    Get the keyframe timestamps of a video, scanning each file version only once
+    
+    Args:
+        video_path: Path to the video file
+        
+    Returns:
+        Sorted keyframe timestamps in seconds (empty if they could not be read)
+    """
+    try:
+        key = (os.path.abspath(video_path), os.stat(video_path).st_mtime_ns)
+    except OSError:
+        return []
+    
+    with _keyframe_cache_lock:
+        keyframes = _keyframe_cache.get(key)
+        if keyframes is not None:
+            _keyframe_cache.move_to_end(key)
+            return keyframes
+    
+    # Scan outside the lock so other videos' lookups don't wait on ffprobe
+    keyframes = get_keyframes(video_path, get_ffmpeg_path())
+    with _keyframe_cache_lock:
+        _keyframe_cache[key] = keyframes
+        while len(_keyframe_cache) > MAX_KEYFRAME_CACHE:
+            _keyframe_cache.popitem(last=False)
+    return keyframes
+
+def get_audio_codec(video_path: str) -> Optional[str]:
+    """
+    Get the codec of the first audio stream using ffprobe
+    
+    Args:
+        video_path: Path to the video file
+        
+    Returns:
+        Codec name (e.g. "aac"), "" if the video has no audio, or None if ffprobe failed
+    """
+    cmd = [
+        get_ffprobe_path(), '-v', 'error', '-select_streams', 'a:0',
+        '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', video_path
+    ]
+    try:
+        result = run_ffmpeg(cmd, capture_stdout=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
 
 def check_video_duration_requirements(video_path: str) -> Tuple[bool, str, float]:
     """
@@ -72,28 +136,168 @@ def check_video_duration_requirements(video_path: str) -> Tuple[bool, str, float
     else:
         return True, f"Video duration OK ({duration:.1f}s)", duration
 
-def extend_video_to_minimum_duration(video_path: str, target_duration: float = 63.0) -> Optional[str]:
+def extend_video_with_stream_copy(video_path: str, target_duration: float, output_path: str) -> Optional[float]:
+    """
+    Loop a video up to target_duration without re-encoding
+    
+    ffmpeg's -stream_loop replays the input's packets from the start and -t
+    cuts the output at the target, so no frame is decoded. The written
+    duration is read from ffmpeg's own report, so the result needs no
+    separate probe.
+    
+    Args:
+        video_path: Path to the input video
+        target_duration: Duration of the extended video in seconds
+        output_path: Path of the extended video
+        
+    Returns:
+        Duration of the extended video in seconds, or None if it was not written
+    """
+    cmd = [
+        get_ffmpeg_path(), '-y', '-hide_banner',
+        '-stream_loop', '-1', '-i', video_path,
+        '-t', f"{target_duration:.3f}",
+        '-c', 'copy', '-movflags', '+faststart',
+        output_path
+    ]
+    try:
+        result = run_ffmpeg(cmd, keep_stderr=True)
+    except OSError as e:
+        print(f"⚠️ Stream-copy extension failed: {e}")
+        return None
+    if result.returncode != 0:
+        print(f"⚠️ Stream-copy extension failed: {result.stderr.strip()[-300:]}")
+        return None
+    if not output_size(output_path):
+        return None
+    
+    input_duration = parse_input_duration(result.stderr)
+    if input_duration is not None:
+        print(f"📏 Source duration reported by ffmpeg: {input_duration:.1f}s")
+    written = parse_output_time(result.stderr)
+    return written if written is not None else target_duration
+
+def check_batch(video_paths: List[str]) -> List[Tuple[bool, str, float]]:
+    """
+    Check the duration requirements of several videos at once
+    
+    Each check waits on a probe subprocess, so they run in parallel threads.
+    
+    Args:
+        video_paths: Paths to the video files
+        
+    Returns:
+        List of (is_valid, message, duration) tuples, in the same order as video_paths
+    """
+    if not video_paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(video_paths))) as executor:
+        return list(executor.map(check_video_duration_requirements, video_paths))
+
+def _write_extended_video(clip, output_path: str, codec: str, encoder_args: List[str]):
+    """
+    Encode a MoviePy clip to output_path with the given H.264 encoder
+    
+    Args:
+        clip: Clip to write
+        output_path: Path of the output video
+        codec: ffmpeg encoder name
+        encoder_args: Its settings from ffmpeg_utils.H264_ENCODERS; these come after
+                      MoviePy's own -preset on the command line, so an encoder-specific -preset wins
+    """
+    # Keep the source sample rate and depth; audio is only written if the clip has any
+    audio_fps = clip.audio.fps if clip.audio is not None else 44100
+    clip.write_videofile(
+        output_path,
+        logger=None,  # No progress bar
+        codec=codec,
+        audio_codec='aac',
+        preset='veryfast',
+        audio=clip.audio is not None,
+        audio_fps=audio_fps,
+        ffmpeg_params=encoder_args
+    )
+
+def faststart_remux(source_path: str, output_path: str) -> bool:
+    """
+    Copy a video into output_path with the moov atom moved to the front
+    
+    A stream-copy remux, so it only costs one read and one write of the file.
+    
+    Args:
+        source_path: Path to the encoded video
+        output_path: Path of the remuxed video
+        
+    Returns:
+        True if the remuxed video was written
+    """
+    cmd = [
+        get_ffmpeg_path(), '-y', '-hide_banner', '-i', source_path,
+        '-c', 'copy', '-movflags', '+faststart', output_path
+    ]
+    try:
+        result = run_ffmpeg(cmd)
+    except OSError as e:
+        print(f"⚠️ Faststart remux failed: {e}")
+        return False
+    if result.returncode != 0:
+        print(f"⚠️ Faststart remux failed: {result.stderr.strip()[-300:]}")
+        return False
+    return bool(output_size(output_path))
+
+def _link_extended_video(video_path: str) -> Optional[str]:
+    """
+    Create the *_extended.mp4 name for a video that needs no extension, without copying it
+    
+    Hardlinks the original (symlinks if hardlinks aren't possible), so
+    cleanup_extended_video later removes only the link.
+    
+    Args:
+        video_path: Path to the original video
+        
+    Returns:
+        Path of the link, or None if no link could be created
+    """
+    link_path = f"{os.path.splitext(video_path)[0]}_extended.mp4"
+    try:
+        os.remove(link_path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return None
+    
+    try:
+        os.link(video_path, link_path)
+    except OSError:
+        try:
+            os.symlink(os.path.abspath(video_path), link_path)
+        except OSError:
+            return None
+    return link_path
+
+def extend_video_to_minimum_duration(video_path: str, target_duration: float = 63.0,
+                                     known_duration: Optional[float] = None) -> Optional[str]:
     """
     Extend video to minimum duration by looping from the beginning
     
     Args:
         video_path: Path to the input video
         target_duration: Target duration in seconds (default 63s = 1.03 minutes)
+        known_duration: Duration of the input if the caller already probed it
         
     Returns:
         Path to the extended video file, or None if failed
     """
+    work_dir = None
     try:
         print(f"🔄 Extending video to {target_duration:.1f} seconds by looping...")
         
-        # Load the original video
-        video = VideoFileClip(video_path)
-        original_duration = video.duration
+        # Check the duration first, so a long enough video is never opened
+        original_duration = known_duration if known_duration is not None else get_video_duration(video_path)
         
         if original_duration >= target_duration:
             print(f"✅ Video already meets minimum duration ({original_duration:.1f}s >= {target_duration:.1f}s)")
-            video.close()
-            return video_path
+            return _link_extended_video(video_path) or video_path
         
         print(f"📏 Original duration: {original_duration:.1f}s")
         print(f"📏 Target duration: {target_duration:.1f}s")
@@ -103,6 +307,41 @@ def extend_video_to_minimum_duration(video_path: str, target_duration: float = 6
         remaining_time = target_duration - original_duration
         print(f"📏 Remaining time to fill: {remaining_time:.1f}s")
         
+        # Create output path
+        base_name = os.path.splitext(video_path)[0]
+        output_path = f"{base_name}_extended.mp4"
+        
+        # Build the video in the temp dir (often RAM-backed) and move it into place once complete
+        work_dir = tempfile.mkdtemp(prefix="extend_")
+        work_path = os.path.join(work_dir, os.path.basename(output_path))
+        
+        # Fast path: loop the original's packets, nothing is decoded or encoded
+        loop_duration = min(remaining_time, original_duration)
+        print(f"🔄 Adding {loop_duration:.1f}s loop from beginning (stream copy)")
+        
+        # End on a keyframe so the last copied GOP is complete; round up so the target is still met
+        output_duration = target_duration
+        keyframes = get_cached_keyframes(video_path)
+        if keyframes and original_duration > 0:
+            loops, position = divmod(target_duration, original_duration)
+            k = bisect.bisect_left(keyframes, position)
+            if k < len(keyframes) and keyframes[k] < original_duration:
+                output_duration = loops * original_duration + keyframes[k]
+        
+        written_duration = extend_video_with_stream_copy(video_path, output_duration, work_path)
+        if written_duration:
+            shutil.move(work_path, output_path)
+            print(f"✅ Video extended successfully: {written_duration:.1f}s")
+            return output_path
+        
+        print("🔄 Falling back to re-encoding the extended video...")
+        # MoviePy (and NumPy, imageio, PIL) is only loaded when this fallback runs
+        from moviepy.editor import VideoFileClip, concatenate_videoclips
+        from moviepy.config import get_setting
+        
+        # Don't start MoviePy's audio reader for a silent video
+        video = VideoFileClip(video_path, audio=get_audio_codec(video_path) != "")
+        
         # Create clips list: [original_video, looped_portion]
         clips = [video]
         
@@ -110,43 +349,29 @@ def extend_video_to_minimum_duration(video_path: str, target_duration: float = 6
         if remaining_time > 0:
             # Create a subclip from the beginning of the video
             # We'll take the minimum of the remaining time or the full video duration
-            loop_duration = min(remaining_time, original_duration)
+            # (subclip reuses the same reader, no second ffmpeg process is started)
             loop_clip = video.subclip(0, loop_duration)
             clips.append(loop_clip)
             
             print(f"🔄 Adding {loop_duration:.1f}s loop from beginning")
         
-        # Concatenate all clips
-        extended_video = concatenate_videoclips(clips)
-        
-        # Create output path
-        base_name = os.path.splitext(video_path)[0]
-        output_path = f"{base_name}_extended.mp4"
+        # Concatenate all clips; same size, so play them back to back instead of compositing
+        extended_video = concatenate_videoclips(clips, method='chain')
         
         print(f"💾 Saving extended video to: {output_path}")
         
-        # Write the extended video
-        extended_video.write_videofile(
-            output_path,
-            verbose=False,
-            logger=None,
-            codec='libx264',
-            audio_codec='aac',
-            preset='ultrafast',
-            threads=4,
-            audio=True,
-            temp_audiofile=None,
-            remove_temp=True,
-            audio_fps=22050,
-            audio_nbytes=2,
-            audio_bufsize=1000,
-            ffmpeg_params=[
-                '-strict', 'experimental',
-                '-movflags', '+faststart',
-                '-tune', 'fastdecode',
-                '-crf', '28'
-            ]
-        )
+        # Write the extended video, on the GPU/media engine when the ffmpeg build has one
+        encoded_path = os.path.join(work_dir, "encoded.mp4")
+        codec, encoder_args = get_h264_encoder(get_setting("FFMPEG_BINARY"))
+        try:
+            _write_extended_video(extended_video, encoded_path, codec, encoder_args)
+        except Exception as e:
+            fallback_codec, fallback_args = H264_ENCODERS[-1]
+            if codec == fallback_codec:
+                raise
+            # Compiled in doesn't mean the hardware is present
+            print(f"⚠️ {codec} encoding failed ({e}), retrying with {fallback_codec}")
+            _write_extended_video(extended_video, encoded_path, fallback_codec, fallback_args)
         
         # Clean up
         video.close()
@@ -154,15 +379,21 @@ def extend_video_to_minimum_duration(video_path: str, target_duration: float = 6
         if len(clips) > 1:
             clips[1].close()  # Close the loop clip
         
-        # Verify the extended video
-        final_duration = get_video_duration(output_path)
-        print(f"✅ Video extended successfully: {final_duration:.1f}s")
+        # Move the moov atom to the front in a separate copy-only pass
+        if not faststart_remux(encoded_path, work_path):
+            os.replace(encoded_path, work_path)
+        shutil.move(work_path, output_path)
+        
+        print(f"✅ Video extended successfully: {extended_video.duration:.1f}s")
         
         return output_path
         
     except Exception as e:
         print(f"❌ Failed to extend video: {e}")
         return None
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
 def process_video_for_upload(video_path: str, log_callback=None) -> Tuple[bool, str, Optional[str]]:
     """
@@ -195,7 +426,7 @@ def process_video_for_upload(video_path: str, log_callback=None) -> Tuple[bool,
         if duration < 60.0:
             log(f"🔄 Video duration ({duration:.1f}s) is less than 1 minute, extending to 1.03 minutes...", "info")
             
-            extended_path = extend_video_to_minimum_duration(video_path, 63.0)
+            extended_path = extend_video_to_minimum_duration(video_path, 63.0, known_duration=duration)
             if extended_path:
                 log(f"✅ Video extended successfully to 1.03 minutes", "success")
                 return True, "Video extended to 1.03 minutes", extended_path
@@ -215,13 +446,17 @@ def process_video_for_upload(video_path: str, log_callback=None) -> Tuple[bool,
 def cleanup_extended_video(video_path: str):
     """
     Clean up extended video file if it's different from the original
+    (for a link to the original, only the link is removed)
     
     Args:
         video_path: Path to the video file to clean up
     """
+    if not video_path or not video_path.endswith("_extended.mp4"):
+        return
     try:
-        if video_path and os.path.exists(video_path) and "_extended" in video_path:
-            os.remove(video_path)
-            print(f"🧹 Cleaned up extended video: {video_path}")
-    except Exception as e:
+        os.remove(video_path)
+        print(f"🧹 Cleaned up extended video: {video_path}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
         print(f"⚠️ Failed to clean up extended video {video_path}: {e}")
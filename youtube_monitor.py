@@ -4,49 +4,226 @@ import time
 import json
 import hashlib
 import pickle
+import functools
+import re
+import atexit
+import math
+import sqlite3
 from datetime import datetime, timedelta
 from tiktok_uploader import tiktok, Video
 from tiktok_uploader.Config import Config
 import yt_dlp
-from moviepy.editor import VideoFileClip, concatenate_videoclips
+from yt_dlp.version import __version__ as _YT_DLP_VERSION
 import argparse
 import threading
+import queue
+import concurrent.futures
 import requests
-from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional, Set
+from collections import OrderedDict
+from ffmpeg_utils import output_size
+
+
+def _version_tuple(version):
+    """(year, month, day) of a yt-dlp version string such as "2023.11.16.232434" """
+    try:
+        return tuple(int(part) for part in version.split('.')[:3])
+    except ValueError:
+        return ()
+
+# A YoutubeDL re-reads params['outtmpl'] on every download since yt-dlp 2022.06.22. Older
+# versions cache the template in __init__, so a reused instance would keep writing to the
+# first download's path; with those, every download builds its own instance
+YDL_REUSE_MIN_VERSION = (2022, 6, 22)
+_YDL_REUSABLE = _version_tuple(_YT_DLP_VERSION) >= YDL_REUSE_MIN_VERSION
+
+# ".../channel/<id>[/...][?...]"; the ID stops at the next path, query or fragment separator
+_CHANNEL_ID_RE = re.compile(r'channel/([^/?#]+)')
+
+def _runs_text(data, key, default=''):
+    """Text of the first run of a scrapetube text field, e.g. video['title']['runs'][0]['text']"""
+    return ((data.get(key) or {}).get('runs') or ({},))[0].get('text', default)
+
+def _simple_text(data, key, default=''):
+    """Value of a scrapetube simpleText field, e.g. video['lengthText']['simpleText']"""
+    return (data.get(key) or {}).get('simpleText', default)
+
+def _last_thumbnail_url(data):
+    """URL of the largest (last) thumbnail of a scrapetube video"""
+    return ((data.get('thumbnail') or {}).get('thumbnails') or ({},))[-1].get('url', '')
+
+def _file_digest(file_path, chunk_size=1 << 20):
+    """BLAKE2b digest of a file's contents, read in 1 MiB chunks"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _dump_json_atomic(file_path, data, indent=None):
+    """Write JSON to a temp file and swap it in, so readers never see a half-written file
+    
+    Args:
+        file_path: Destination file
+        data: JSON-serializable object
+        indent: Indentation for files people edit by hand; compact when None
+    """
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if indent is None:
+            json.dump(data, f, separators=(',', ':'))
+        else:
+            json.dump(data, f, indent=indent)
+    os.replace(tmp_path, file_path)
+
+
+class BloomFilter:
+    """Bloom filter over string keys: ~1.2 bytes per key at a 0.1% false-positive rate"""
+    
+    def __init__(self, capacity=10000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, key):
+        # Double hashing: k bit positions from the two halves of one 128-bit digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+    
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
 
 
 class YouTubeMonitor:
     def __init__(self, config_file="monitor_config.json", log_callback=None):
         self.config = self.load_config(config_file)
         self.tiktok_config = Config.get()
-        self.processed_videos = self.load_processed_videos()
         self.channel_last_check = self.load_channel_last_check()
         self.log_callback = log_callback  # Callback function for logging
+        self._log_stamp = (None, "")  # (second, "HH:MM:SS") of the last log line
+        
+        # Resolved and created once rather than on every check/download
+        self._download_path_abs = os.path.abspath(self.config["download_path"])
+        os.makedirs(self._download_path_abs, exist_ok=True)
         
         # AGGRESSIVE CACHING: Multiple cache layers
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # Keep-alive pool big enough for every channel thread, with quick retries
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # yt-dlp cookies, looked up once instead of on every download
+        self._cookies_path = 'cookies.txt' if os.path.exists('cookies.txt') else None
+        
+        # TikTok session cookies per account, read from disk once (see _get_cookies)
+        self._cookie_cache = {}
+        self._cookie_cache_lock = threading.Lock()
         
-        # In-memory cache for scrapetube data (fastest access)
-        self.scrapetube_cache = OrderedDict()
+        # Idle YoutubeDL instances, reused across downloads (see _acquire_ydl)
+        self._ydl_idle = []
+        self._ydl_lock = threading.Lock()
+        atexit.register(self._close_ydls)
+        
+        # In-memory cache for scrapetube data (fastest access); dicts keep
+        # insertion order, so the first key is always the least recently used
+        self.scrapetube_cache = {}
         self.max_cache_size = 50  # Keep last 50 channel checks in memory
         
         # Cache for parsed video data
         self.parsed_cache = {}
         
-        # Cache for video hashes (avoid reprocessing)
-        self.video_hash_cache = set()
+        # Video keys "video_id|title" (avoid reprocessing): a Bloom filter answers
+        # "never seen" from memory, positives are confirmed in processed.db
+        self.video_hash_db = None
+        self.video_hash_bloom = BloomFilter()
+        self.video_hash_lock = threading.Lock()  # Guards writes on video_hash_db
+        self._bloom_lock = threading.Lock()  # Guards adds to video_hash_bloom and its rebuild
+        self._db_file = self.config.get("processed_db_file", "processed.db")
+        self._db_local = threading.local()  # Per-thread read connections (see _read_db)
+        self.has_legacy_hashes = False  # Cache still holds MD5 keys from older versions
+        # Keys already confirmed processed; each channel's newest video is looked up every
+        # cycle, so this answers the common hit without a database query
+        self._confirmed_keys = OrderedDict()
+        self._confirmed_lock = threading.Lock()  # Channel, split and upload threads all update it
+        self.max_confirmed_keys = 1024
+        
+        # Newly processed videos are written to processed.db in batches by a writer thread;
+        # until then their rows wait in _pending_hashes (key -> row) so lookups still see them
+        self._hash_write_q = queue.SimpleQueue()
+        self._pending_hashes = {}
+        self.hash_flush_interval = 2  # seconds
+        self.hash_flush_batch = 32
+        # Only each channel's newest video is ever checked, so old rows can go
+        self.processed_history_max = self.config.get("processed_history_max", 50000)
+        # Rows per history table (counted at startup, then by inserts; replacements over-count,
+        # which only prunes early). Pruning waits until a table is this far over the limit
+        self._history_rows = {"processed": 0, "processed_content": 0}
+        self.history_prune_slack = 1000
         
         # Load existing caches
         self.load_scrapetube_cache()
         self.load_video_hash_cache()
         
+        # The scrapetube cache is written by a background flusher instead of on the hot path
+        self._cache_dirty = threading.Event()
+        self.cache_debounce_s = self.config.get("cache_debounce_s", 5)
+        threading.Thread(target=self._cache_flush_loop, name='cache-flush', daemon=True).start()
+        atexit.register(self.flush_caches)
+        threading.Thread(target=self._hash_writer, name='hash-writer', daemon=True).start()
+        
+        # Finished videos and parts are deleted by a janitor thread, off the worker's return path
+        self._cleanup_q = queue.Queue()
+        threading.Thread(target=self._cleanup_worker, name='cleanup', daemon=True).start()
+        atexit.register(self._drain_cleanup)
+        atexit.register(self._flush_pending_hashes)
+        
+        # Channel checks and downloads are network-bound; splits wait on ffmpeg.
+        # Separate pools keep a long download or split from holding up the next tick
+        self.io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(8, len(self.config.get('channels', []))), thread_name_prefix='yt-io'
+        )
+        self.cpu_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 2) // 2), thread_name_prefix='yt-split'
+        )
+        self.upload_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='tt-up')
+        self.channel_futures = {}  # channel_id -> Future of its in-flight check
+        self._channel_proxies = {}  # channel_id -> proxy string (see get_channel_proxy)
+        self.split_futures = set()
+        self.split_futures_lock = threading.Lock()  # Added on channel threads, discarded from callbacks
+        self._ffmpeg_slots = threading.BoundedSemaphore(max(1, (os.cpu_count() or 2) // 2))
+        self.videos_in_progress = set()  # Video keys being downloaded/split/uploaded
+        self.in_progress_lock = threading.Lock()
+        
     def log(self, message, level="info"):
         """Log message with optional callback to GUI"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        # Format the timestamp once per second; both parts are swapped in together
+        # so log calls from other threads never see a mismatched pair
+        now = int(time.time())
+        second, timestamp = self._log_stamp
+        if second != now:
+            timestamp = time.strftime("%H:%M:%S", time.localtime(now))
+            self._log_stamp = (now, timestamp)
         formatted_message = f"[{timestamp}] {message}"
         
         # Print to console
@@ -73,24 +250,9 @@ class YouTubeMonitor:
                 "processed_videos_file": "processed_videos.json",
                 "channel_last_check_file": "channel_last_check.json"
             }
-            with open(config_file, 'w') as f:
-                json.dump(default_config, f, indent=4)
+            _dump_json_atomic(config_file, default_config, indent=4)
             return default_config
     
-    def load_processed_videos(self):
-        """Load list of already processed videos"""
-        file_path = self.config.get("processed_videos_file", "processed_videos.json")
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        return []
-    
-    def save_processed_videos(self):
-        """Save list of processed videos"""
-        file_path = self.config.get("processed_videos_file", "processed_videos.json")
-        with open(file_path, 'w') as f:
-            json.dump(self.processed_videos, f, indent=4)
-    
     def load_channel_last_check(self):
         """Load last check time for each channel"""
         file_path = self.config.get("channel_last_check_file", "channel_last_check.json")
@@ -102,50 +264,130 @@ class YouTubeMonitor:
     def save_channel_last_check(self):
         """Save last check time for each channel"""
         file_path = self.config.get("channel_last_check_file", "channel_last_check.json")
-        with open(file_path, 'w') as f:
-            json.dump(self.channel_last_check, f, indent=4)
+        _dump_json_atomic(file_path, dict(self.channel_last_check))
+    
+    def _load_legacy_pickle(self, pickle_file):
+        """Load a cache written by older versions (pickle); it is saved as JSON from then on"""
+        if not os.path.exists(pickle_file):
+            return None
+        with open(pickle_file, 'rb') as f:
+            data = pickle.load(f)
+        self.log(f"Migrating {pickle_file} to JSON")
+        return data
     
     def load_scrapetube_cache(self):
         """Load scrapetube cache from disk"""
-        cache_file = "scrapetube_cache.pkl"
+        cache_file = "scrapetube_cache.json"
         try:
             if os.path.exists(cache_file):
-                with open(cache_file, 'rb') as f:
-                    self.scrapetube_cache = pickle.load(f)
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.scrapetube_cache = json.load(f)
+            else:
+                self.scrapetube_cache = dict(self._load_legacy_pickle("scrapetube_cache.pkl") or {})
+            if self.scrapetube_cache:
                 self.log(f"Loaded scrapetube cache with {len(self.scrapetube_cache)} entries")
         except Exception as e:
             self.log(f"Failed to load scrapetube cache: {e}", "warning")
-            self.scrapetube_cache = OrderedDict()
+            self.scrapetube_cache = {}
     
     def save_scrapetube_cache(self):
         """Save scrapetube cache to disk"""
-        cache_file = "scrapetube_cache.pkl"
+        cache_file = "scrapetube_cache.json"
         try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(self.scrapetube_cache, f)
+            # {key: {"videos": [...], "timestamp": t}}, compact since nobody reads it by hand
+            # Snapshot first: channel threads may add entries while this runs
+            _dump_json_atomic(cache_file, dict(self.scrapetube_cache))
+            return True
         except Exception as e:
             self.log(f"Failed to save scrapetube cache: {e}", "warning")
+            return False
     
     def load_video_hash_cache(self):
-        """Load video hash cache from disk"""
-        hash_file = "video_hash_cache.pkl"
+        """Open the processed video database and build the Bloom filter from it"""
         try:
-            if os.path.exists(hash_file):
-                with open(hash_file, 'rb') as f:
-                    self.video_hash_cache = pickle.load(f)
-                self.log(f"Loaded video hash cache with {len(self.video_hash_cache)} entries")
+            self.video_hash_db = sqlite3.connect(self._db_file, check_same_thread=False)
+            # WAL: lookups from channel threads don't block on the writer's inserts
+            self.video_hash_db.execute("PRAGMA journal_mode=WAL")
+            self.video_hash_db.execute(
+                "CREATE TABLE IF NOT EXISTS processed ("
+                "hash TEXT PRIMARY KEY, video_id TEXT, title TEXT, ts INTEGER)"
+            )
+            # Digests of downloaded files, to catch renamed videos whose key changed
+            self.video_hash_db.execute(
+                "CREATE TABLE IF NOT EXISTS processed_content ("
+                "digest TEXT PRIMARY KEY, video_id TEXT, ts INTEGER)"
+            )
+            hashes = [row[0] for row in self.video_hash_db.execute("SELECT hash FROM processed")]
+            if not hashes:
+                hashes = self._migrate_video_hash_cache()
+            self._prune_history()  # Also takes the row counts later inserts add to
+            if len(hashes) > self.processed_history_max:
+                hashes = [row[0] for row in self.video_hash_db.execute("SELECT hash FROM processed")]
+            
+            self.video_hash_bloom = BloomFilter(capacity=max(10000, 2 * len(hashes)))
+            for video_hash in hashes:
+                self.video_hash_bloom.add(video_hash)
+            self.has_legacy_hashes = any('|' not in key for key in hashes)
+            if hashes:
+                self.log(f"Loaded video hash cache with {len(hashes)} entries")
         except Exception as e:
             self.log(f"Failed to load video hash cache: {e}", "warning")
-            self.video_hash_cache = set()
     
-    def save_video_hash_cache(self):
-        """Save video hash cache to disk"""
-        hash_file = "video_hash_cache.pkl"
-        try:
-            with open(hash_file, 'wb') as f:
-                pickle.dump(self.video_hash_cache, f)
-        except Exception as e:
-            self.log(f"Failed to save video hash cache: {e}", "warning")
+    def _migrate_video_hash_cache(self):
+        """Import the JSON (or older pickle) hash cache into processed.db"""
+        hash_file = "video_hash_cache.json"
+        if os.path.exists(hash_file):
+            with open(hash_file, 'r', encoding='utf-8') as f:
+                hashes = json.load(f)
+        else:
+            hashes = list(self._load_legacy_pickle("video_hash_cache.pkl") or ())
+        if hashes:
+            self.log(f"Migrating {len(hashes)} video hashes to the processed database")
+            with self.video_hash_db:
+                self.video_hash_db.executemany(
+                    "INSERT OR IGNORE INTO processed (hash) VALUES (?)",
+                    ((video_hash,) for video_hash in hashes)
+                )
+        return hashes
+    
+    def _read_db(self):
+        """This thread's read connection to processed.db
+        
+        Writes all go through video_hash_db under video_hash_lock; lookups use their
+        own connection per thread, so with WAL they never wait on the writer or each other.
+        """
+        db = getattr(self._db_local, 'db', None)
+        if db is None:
+            db = self._db_local.db = sqlite3.connect(self._db_file)
+        return db
+    
+    def _video_hash_in_db(self, video_hash):
+        """Confirm a Bloom filter hit against processed.db"""
+        if self.video_hash_db is None:
+            return False
+        row = self._read_db().execute(
+            "SELECT 1 FROM processed WHERE hash = ?", (video_hash,)
+        ).fetchone()
+        return row is not None
+    
+    def flush_caches(self):
+        """Save the caches that changed since the last flush"""
+        # Clear the flag before saving so changes made during the save are kept for the next flush
+        if self._cache_dirty.is_set():
+            self._cache_dirty.clear()
+            if not self.save_scrapetube_cache():
+                self._cache_dirty.set()
+    
+    def _cache_flush_loop(self):
+        """Background thread: once the cache is marked dirty, wait cache_debounce_s and save
+        
+        Every change made during the wait is folded into that one save, so the cache is
+        written at most once per debounce window however often it changes.
+        """
+        while True:
+            self._cache_dirty.wait()
+            time.sleep(self.cache_debounce_s)
+            self.flush_caches()
     
     def get_cached_scrapetube_data(self, channel_id, max_age_seconds=300):
         """Get scrapetube data from cache if available and fresh"""
@@ -158,6 +400,8 @@ class YouTubeMonitor:
             
             # Check if cache is still fresh (5 minutes by default)
             if current_time - cache_time < max_age_seconds:
+                # Move to the end so the LRU eviction keeps entries that are in use
+                self.scrapetube_cache[cache_key] = self.scrapetube_cache.pop(cache_key)
                 self.log(f"Using cached scrapetube data for {channel_id} (age: {current_time - cache_time:.1f}s)")
                 return cached_data.get('videos')
         
@@ -167,7 +411,8 @@ class YouTubeMonitor:
         """Cache scrapetube data"""
         cache_key = f"scrapetube_{channel_id}"
         
-        # Add to cache
+        # Add to cache (re-inserted at the end, as most recently used)
+        self.scrapetube_cache.pop(cache_key, None)
         self.scrapetube_cache[cache_key] = {
             'videos': videos,
             'timestamp': time.time()
@@ -175,31 +420,156 @@ class YouTubeMonitor:
         
         # Maintain cache size (LRU)
         if len(self.scrapetube_cache) > self.max_cache_size:
-            self.scrapetube_cache.popitem(last=False)  # Remove oldest
+            del self.scrapetube_cache[next(iter(self.scrapetube_cache))]  # Remove oldest
         
-        # Save to disk periodically
-        if len(self.scrapetube_cache) % 10 == 0:  # Save every 10 additions
-            self.save_scrapetube_cache()
+        # Written to disk by the background flusher
+        self._cache_dirty.set()
+    
+    def get_video_key(self, video_id, video_title):
+        """Cache key for a video; the YouTube ID is already unique, so no hashing is needed"""
+        return f"{video_id}|{video_title}"
+    
+    def is_video_processed(self, video_key, video_id=None, video_title=None):
+        """Check if video key is in cache (Bloom filter in memory, hits confirmed on disk)"""
+        with self._confirmed_lock:
+            if video_key in self._confirmed_keys:
+                return True
+        if video_key in self.video_hash_bloom and (
+            video_key in self._pending_hashes or self._video_hash_in_db(video_key)
+        ):
+            self._remember_confirmed(video_key)
+            return True
+        # Entries written before the switch from MD5 keys
+        if self.has_legacy_hashes and video_id is not None:
+            legacy_hash = hashlib.md5(f"{video_id}_{video_title}".encode()).hexdigest()
+            return legacy_hash in self.video_hash_bloom and self._video_hash_in_db(legacy_hash)
+        return False
     
-    def is_video_processed(self, video_hash):
-        """Check if video hash is in cache (fast in-memory check)"""
-        return video_hash in self.video_hash_cache
+    def _remember_confirmed(self, video_key):
+        """Add a key to the confirmed set, dropping the oldest past max_confirmed_keys"""
+        with self._confirmed_lock:
+            self._confirmed_keys[video_key] = None
+            if len(self._confirmed_keys) > self.max_confirmed_keys:
+                self._confirmed_keys.popitem(last=False)
     
-    def mark_video_processed(self, video_hash):
+    def mark_video_processed(self, video_hash, video_id=None, video_title=None):
         """Mark video as processed in cache"""
-        self.video_hash_cache.add(video_hash)
-        
-        # Save periodically
-        if len(self.video_hash_cache) % 50 == 0:  # Save every 50 additions
-            self.save_video_hash_cache()
+        # Several split threads mark videos at once; a key added to a filter that
+        # another thread is replacing would be lost, and lookups trust a Bloom miss
+        with self._bloom_lock:
+            bloom = self.video_hash_bloom
+            if bloom.count >= bloom.capacity and self.video_hash_db is not None:
+                # Past capacity the false-positive rate climbs; start over with a bigger filter.
+                # Snapshot pending keys first: the writer commits a row before dropping it from
+                # _pending_hashes, so every key is in the snapshot or visible in the database
+                pending = list(self._pending_hashes)
+                hashes = [row[0] for row in self._read_db().execute("SELECT hash FROM processed")]
+                bloom = BloomFilter(capacity=2 * bloom.capacity, error_rate=bloom.error_rate)
+                for key in hashes + pending:
+                    bloom.add(key)
+                self.video_hash_bloom = bloom
+            bloom.add(video_hash)
+            
+            # Written to disk by the hash writer thread
+            row = (video_hash, video_id, video_title, int(time.time()))
+            self._pending_hashes[video_hash] = row
+        self._hash_write_q.put(row)
+    
+    def _write_hashes(self, rows):
+        """Insert a batch of processed video rows in one transaction"""
+        if self.video_hash_db is None:
+            return
+        try:
+            with self.video_hash_lock, self.video_hash_db:
+                self.video_hash_db.executemany(
+                    "INSERT OR REPLACE INTO processed (hash, video_id, title, ts) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+        except Exception as e:
+            # Left in _pending_hashes: still deduplicated, and retried at exit
+            self.log(f"Failed to save video hashes: {e}", "warning")
+            return
+        for row in rows:
+            self._pending_hashes.pop(row[0], None)
+        self._grow_history("processed", len(rows))
+    
+    def _grow_history(self, table, count):
+        """Count rows inserted into a history table, pruning once it is well past processed_history_max"""
+        with self.video_hash_lock:
+            self._history_rows[table] += count
+            over = self._history_rows[table] > self.processed_history_max + self.history_prune_slack
+        if over:
+            self._prune_history()
+    
+    def _prune_history(self):
+        """Drop the oldest rows beyond processed_history_max (rows migrated without a ts go first)"""
+        try:
+            with self.video_hash_lock, self.video_hash_db:
+                for table in self._history_rows:
+                    self.video_hash_db.execute(
+                        f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} ORDER BY ts, rowid "
+                        f"LIMIT max(0, (SELECT COUNT(*) FROM {table}) - ?))",
+                        (self.processed_history_max,)
+                    )
+                    self._history_rows[table] = self.video_hash_db.execute(
+                        f"SELECT COUNT(*) FROM {table}"
+                    ).fetchone()[0]
+        except Exception as e:
+            self.log(f"Failed to prune processed history: {e}", "warning")
+    
+    def _hash_writer(self):
+        """Background thread: write queued rows every hash_flush_interval seconds or hash_flush_batch rows"""
+        while True:
+            rows = [self._hash_write_q.get()]
+            deadline = time.monotonic() + self.hash_flush_interval
+            while len(rows) < self.hash_flush_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(self._hash_write_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_hashes(rows)
+    
+    def _flush_pending_hashes(self):
+        """Write every row the writer thread hasn't committed yet (at exit)"""
+        rows = list(self._pending_hashes.values())
+        if rows:
+            self._write_hashes(rows)
+    
+    def is_content_processed(self, digest):
+        """Check if a downloaded file with these exact contents was already processed"""
+        if self.video_hash_db is None:
+            return False
+        row = self._read_db().execute(
+            "SELECT 1 FROM processed_content WHERE digest = ?", (digest,)
+        ).fetchone()
+        return row is not None
+    
+    def mark_content_processed(self, digest, video_id=None):
+        """Remember the contents of a processed video file"""
+        if self.video_hash_db is None:
+            return
+        try:
+            with self.video_hash_lock, self.video_hash_db:
+                self.video_hash_db.execute(
+                    "INSERT OR REPLACE INTO processed_content (digest, video_id, ts) VALUES (?, ?, ?)",
+                    (digest, video_id, int(time.time()))
+                )
+        except Exception as e:
+            self.log(f"Failed to save content hash: {e}", "warning")
+            return
+        self._grow_history("processed_content", 1)
     
-    def get_channel_id_from_url(self, channel_url):
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def get_channel_id_from_url(channel_url):
         """Extract channel ID from various YouTube URL formats"""
-        if "channel/" in channel_url:
-            return channel_url.split("channel/")[1].split("/")[0]
-        elif "c/" in channel_url:
-            # Handle custom URLs - this is more complex and may need additional handling
-            return None
+        match = _CHANNEL_ID_RE.search(channel_url)
+        if match:
+            return match.group(1)
+        # Custom /c/ and /@handle URLs carry a name, not an ID; resolving it needs a page fetch
         return None
     
     def get_channel_videos_scrapetube(self, channel_id: str, limit: int = 5) -> List[Dict]:
@@ -222,22 +592,23 @@ class YouTubeMonitor:
             self.log(f"Fetching videos from channel: {channel_id}")
             
             # Get videos using scrapetube
-            videos = scrapetube.get_channel(channel_id, limit=limit)
+            videos = list(scrapetube.get_channel(channel_id, limit=limit))
             
-            video_list = []
-            for video in videos:
-                video_data = {
+            fetched_at = datetime.now().isoformat()
+            video_list = [
+                {
                     'id': video.get('videoId'),
-                    'title': video.get('title', {}).get('runs', [{}])[0].get('text', 'Unknown Title'),
+                    'title': _runs_text(video, 'title', 'Unknown Title'),
                     'url': f"https://www.youtube.com/watch?v={video.get('videoId')}",
-                    'published': video.get('publishedTimeText', {}).get('simpleText', 'Unknown'),
-                    'view_count': video.get('viewCountText', {}).get('simpleText', '0'),
-                    'duration': video.get('lengthText', {}).get('simpleText', 'Unknown'),
-                    'thumbnail': video.get('thumbnail', {}).get('thumbnails', [{}])[-1].get('url', ''),
-                    'channel_name': video.get('ownerText', {}).get('runs', [{}])[0].get('text', 'Unknown Channel'),
-                    'fetched_at': datetime.now().isoformat()
+                    'published': _simple_text(video, 'publishedTimeText', 'Unknown'),
+                    'view_count': _simple_text(video, 'viewCountText', '0'),
+                    'duration': _simple_text(video, 'lengthText', 'Unknown'),
+                    'thumbnail': _last_thumbnail_url(video),
+                    'channel_name': _runs_text(video, 'ownerText', 'Unknown Channel'),
+                    'fetched_at': fetched_at
                 }
-                video_list.append(video_data)
+                for video in videos
+            ]
             
             # Cache the results
             self.cache_scrapetube_data(channel_id, video_list)
@@ -249,16 +620,10 @@ class YouTubeMonitor:
             self.log(f"Error fetching videos from {channel_id}: {e}", "error")
             return []
     
-    def download_video(self, video_url, output_path):
-        """Download video using yt-dlp with retries and better timeout handling"""
-        # Ensure the download directory exists
-        download_dir = os.path.dirname(output_path)
-        if not os.path.exists(download_dir):
-            os.makedirs(download_dir)
-        
-        ydl_opts = {
+    def _ydl_opts_template(self):
+        """Baseline yt-dlp options; outtmpl is set per download"""
+        return {
             'format': 'best[ext=mp4]/best[ext=webm]/best',  # Best quality MP4/WebM
-            'outtmpl': output_path,
             'quiet': False,
             'no_warnings': False,
             'socket_timeout': 30,  # Reasonable timeout
@@ -273,12 +638,45 @@ class YouTubeMonitor:
                 'Accept-Encoding': 'gzip,deflate',
             },
             # Try cookies file if available, but don't fail if not found
-            'cookiefile': 'cookies.txt' if os.path.exists('cookies.txt') else None,
+            'cookiefile': self._cookies_path,
             'extract_flat': False,
             'ignoreerrors': False,
             'no_check_certificate': True,
             'prefer_insecure': True,
         }
+    
+    def _acquire_ydl(self):
+        """Take an idle YoutubeDL, or build one if every instance is busy
+        
+        Building a YoutubeDL loads every extractor and sets up the cookie jar and
+        HTTP handlers, so instances are reused. They aren't thread-safe, so each
+        download holds one exclusively until _release_ydl instead of sharing a
+        single instance behind a lock (which would serialize all downloads).
+        """
+        with self._ydl_lock:
+            if self._ydl_idle:
+                return self._ydl_idle.pop()
+        return yt_dlp.YoutubeDL(self._ydl_opts_template())
+    
+    def _release_ydl(self, ydl):
+        """Return a YoutubeDL to the idle list for the next download"""
+        with self._ydl_lock:
+            self._ydl_idle.append(ydl)
+    
+    def _close_ydls(self):
+        """Close the idle YoutubeDL instances (saves the cookie jar)"""
+        for ydl in self._ydl_idle:
+            try:
+                ydl.close()
+            except Exception:
+                pass
+    
+    def download_video(self, video_url, output_path):
+        """Download video using yt-dlp with retries and better timeout handling"""
+        # Ensure the download directory exists (the configured one is created in __init__)
+        download_dir = os.path.dirname(output_path)
+        if download_dir != self._download_path_abs:
+            os.makedirs(download_dir, exist_ok=True)
         
         max_attempts = 2
         attempt = 0
@@ -288,12 +686,22 @@ class YouTubeMonitor:
             try:
                 self.log(f"Downloading video (attempt {attempt}/{max_attempts}): {video_url}")
                 
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([video_url])
+                if _YDL_REUSABLE:
+                    ydl = self._acquire_ydl()
+                    try:
+                        ydl.params['outtmpl'] = {'default': output_path}
+                        ydl.download([video_url])
+                    finally:
+                        self._release_ydl(ydl)
+                else:
+                    with yt_dlp.YoutubeDL({**self._ydl_opts_template(), 'outtmpl': output_path}) as ydl:
+                        ydl.download([video_url])
                 
-                if os.path.exists(output_path):
+                # One stat call covers both the existence check and the size
+                file_size = output_size(output_path)
+                if file_size is not None:
                     # Verify the file is valid and not empty
-                    if os.path.getsize(output_path) > 0:
+                    if file_size > 0:
                         self.log(f"Download completed successfully: {output_path}", "success")
                         return output_path
                     else:
@@ -336,12 +744,12 @@ class YouTubeMonitor:
         try:
             self.log(f"📤 Worker {part_num}: Starting upload for part {part_num}/{total_parts} to TikTok account: {tiktok_cookie}", "info")
             
-            # Check if file exists and has content
-            if not os.path.exists(part_path):
+            # Check if file exists and has content (one stat call)
+            file_size = output_size(part_path)
+            if file_size is None:
                 self.log(f"❌ Worker {part_num}: Part file not found: {part_path}", "error")
                 return
                 
-            file_size = os.path.getsize(part_path)
             if file_size == 0:
                 self.log(f"❌ Worker {part_num}: Part file is empty (0 bytes)", "error")
                 return
@@ -353,12 +761,8 @@ class YouTubeMonitor:
             
             if success:
                 self.log(f"✅ Worker {part_num}: Successfully uploaded part {part_num} of {total_parts} to {tiktok_cookie}", "success")
-                # Clean up the part file immediately after successful upload
-                try:
-                    os.remove(part_path)
-                    self.log(f"🧹 Worker {part_num}: Cleaned up part file", "info")
-                except Exception as e:
-                    self.log(f"⚠️ Worker {part_num}: Failed to clean up part file: {e}", "warning")
+                # Clean up the part file after successful upload
+                self.queue_cleanup(part_path, f"part file {part_num} of {total_parts}")
             else:
                 self.log(f"❌ Worker {part_num}: Failed to upload part {part_num} of {total_parts} to {tiktok_cookie}", "error")
                 # Keep the file for potential retry or manual upload
@@ -403,7 +807,7 @@ class YouTubeMonitor:
                 filename=os.path.basename(output_path)
             )
             
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            if (output_size(output_path) or 0) > 0:
                 self.log(f"Pytube download successful: {output_path}", "success")
                 return output_path
             else:
@@ -414,9 +818,13 @@ class YouTubeMonitor:
             self.log(f"Pytube fallback failed: {str(e)}", "error")
             return None
     
-    def split_video(self, video_path, num_parts=3, video_title="", tiktok_cookie="default", channel_name="Unknown", proxy_config=None):
-        """Split video into specified number of parts - ULTRA FAST VERSION with duration processing"""
-        video = None
+    def split_video(self, video_path, num_parts=3, video_title="", tiktok_cookie="default", channel_name="Unknown", proxy_config=None, upload_futures=None):
+        """Split video into specified number of parts - ULTRA FAST VERSION with duration processing
+        
+        Args:
+            upload_futures: Optional list that receives the part upload futures. When given,
+                            return as soon as the uploads are submitted instead of waiting
+        """
         split_videos = []
         temp_files = []
         extended_video_path = None
@@ -431,31 +839,34 @@ class YouTubeMonitor:
             # Import duration processing utilities
             from video_duration_utils import process_video_for_upload, cleanup_extended_video
             
-            # Process video according to duration requirements
-            should_upload, message, processed_video_path = process_video_for_upload(
-                video_path, 
-                log_callback=self.log
-            )
+            # Extending and splitting run ffmpeg; hold a slot so concurrent splits
+            # (split pool, GUI and pubsub callers alike) don't oversubscribe the CPU
+            with self._ffmpeg_slots:
+                # Process video according to duration requirements
+                should_upload, message, processed_video_path = process_video_for_upload(
+                    video_path, 
+                    log_callback=self.log
+                )
             
-            if not should_upload:
-                self.log(f"❌ Video rejected: {message}", "error")
-                return []
+                if not should_upload:
+                    self.log(f"❌ Video rejected: {message}", "error")
+                    return []
             
-            # Use the processed video path (original or extended)
-            video_to_split = processed_video_path
-            if processed_video_path != video_path:
-                extended_video_path = processed_video_path
-                self.log(f"📹 Using extended video for splitting: {processed_video_path}", "info")
+                # Use the processed video path (original or extended)
+                video_to_split = processed_video_path
+                if processed_video_path != video_path:
+                    extended_video_path = processed_video_path
+                    self.log(f"📹 Using extended video for splitting: {processed_video_path}", "info")
             
-            self.log(f"✅ Duration processing completed: {message}", "success")
+                self.log(f"✅ Duration processing completed: {message}", "success")
             
-            # Use the ffmpeg splitting method (actually crops the video with ffmpeg)
-            from ffmpeg_split import ffmpeg_split_video
+                # Use the ffmpeg splitting method (actually crops the video with ffmpeg)
+                from ffmpeg_split import ffmpeg_split_video
             
-            # Split video using ffmpeg method (crops into time segments with ffmpeg)
-            # Get the maximum duration limit from config (default 113 seconds = 1:53 minutes)
-            max_duration = self.config.get("video_duration_limit", 113)
-            split_videos = ffmpeg_split_video(video_to_split, num_parts, max_duration=max_duration)
+                # Split video using ffmpeg method (crops into time segments with ffmpeg)
+                # Get the maximum duration limit from config (default 113 seconds = 1:53 minutes)
+                max_duration = self.config.get("video_duration_limit", 113)
+                split_videos = ffmpeg_split_video(video_to_split, num_parts, max_duration=max_duration)
             
             if not split_videos:
                 self.log("❌ Fast splitting failed", "error")
@@ -468,26 +879,22 @@ class YouTubeMonitor:
             
             # Handle uploads if auto-upload is enabled
             if self.config.get("auto_upload", True):
-                upload_workers = []
-                
-                for i, part_path in enumerate(split_videos):
-                    self.log(f"🚀 Starting upload worker for part {i+1}...", "info")
-                    
-                    # Create upload worker thread for this part with base title only
-                    upload_title = video_title
-                    upload_worker = threading.Thread(
-                        target=self.upload_part_worker,
-                        args=(part_path, upload_title, tiktok_cookie, i+1, len(split_videos), proxy_config),
-                        daemon=True
+                # Submit an upload for each part with base title only; the pool's threads are reused
+                self.log(f"🚀 Starting upload workers for {len(split_videos)} parts...", "info")
+                part_futures = [
+                    self.upload_executor.submit(
+                        self.upload_part_worker, part_path, video_title, tiktok_cookie, i+1, len(split_videos), proxy_config
                     )
-                    upload_workers.append(upload_worker)
-                    upload_worker.start()
+                    for i, part_path in enumerate(split_videos)
+                ]
                 
-                # Wait for all upload workers to complete
-                if upload_workers:
+                if upload_futures is not None:
+                    # The caller follows up once they finish; don't hold its thread meanwhile
+                    upload_futures.extend(part_futures)
+                elif part_futures:
+                    # Wait for all upload workers to complete
                     self.log(f"⏳ Waiting for all upload workers to complete...", "info")
-                    for worker in upload_workers:
-                        worker.join()
+                    concurrent.futures.wait(part_futures)
                     
                     self.log(f"✅ All upload workers completed", "success")
             else:
@@ -502,12 +909,6 @@ class YouTubeMonitor:
             return []
             
         finally:
-            # Clean up main video
-            if video:
-                try:
-                    video.close()
-                except:
-                    pass
             # Clean up any temp files that might be left
             for file in temp_files:
                 try:
@@ -523,16 +924,27 @@ class YouTubeMonitor:
                 except Exception as e:
                     self.log(f"⚠️ Failed to clean up extended video: {e}", "warning")
     
+    def _get_cookies(self, cookie_name):
+        """TikTok cookies for an account as {name: value}, loaded from its session file on first use"""
+        with self._cookie_cache_lock:
+            cookie_map = self._cookie_cache.get(cookie_name)
+            if cookie_map is None:
+                from tiktok_uploader.cookies import load_cookies_from_file
+                cookies = load_cookies_from_file(f"tiktok_session-{cookie_name}")
+                cookie_map = {c["name"]: c["value"] for c in cookies}
+                self._cookie_cache[cookie_name] = cookie_map
+            return cookie_map
+    
     def upload_to_tiktok(self, video_path, title, cookie_name, proxy_config=None):
         """Upload video to TikTok"""
         try:
             self.log(f"🍪 Uploading to TikTok account '{cookie_name}': {title}")
             self.log(f"📁 File path: {video_path}")
-            self.log(f"📁 File exists: {os.path.exists(video_path)}")
+            file_size = output_size(video_path)
+            self.log(f"📁 File exists: {file_size is not None}")
             
             # Additional file checks
-            if os.path.exists(video_path):
-                file_size = os.path.getsize(video_path)
+            if file_size is not None:
                 self.log(f"📊 File size: {file_size} bytes")
                 
                 # Check if file is too small (TikTok minimum requirements)
@@ -540,10 +952,9 @@ class YouTubeMonitor:
                     self.log(f"⚠️ Warning: File seems very small ({file_size} bytes)", "warning")
             
             # Load and verify cookies before upload
-            from tiktok_uploader.cookies import load_cookies_from_file
-            cookies = load_cookies_from_file(f"tiktok_session-{cookie_name}")
-            session_id = next((c["value"] for c in cookies if c["name"] == 'sessionid'), None)
-            dc_id = next((c["value"] for c in cookies if c["name"] == 'tt-target-idc'), None)
+            cookie_map = self._get_cookies(cookie_name)
+            session_id = cookie_map.get('sessionid')
+            dc_id = cookie_map.get('tt-target-idc')
             
             if session_id and dc_id:
                 self.log(f"🔐 Using session ID: {session_id[:10]}... (datacenter: {dc_id})")
@@ -585,6 +996,9 @@ class YouTubeMonitor:
             return True
         except Exception as e:
             self.log(f"❌ Error uploading to TikTok account '{cookie_name}': {e}", "error")
+            # The session may have been refreshed on disk; reload it for the next upload
+            with self._cookie_cache_lock:
+                self._cookie_cache.pop(cookie_name, None)
             import traceback
             self.log(f"Upload error details for '{cookie_name}': {traceback.format_exc()}", "error")
             return False
@@ -621,45 +1035,145 @@ class YouTubeMonitor:
                 return []
             
             # Check if this is a new video
-            video_hash = hashlib.md5(f"{video_id}_{video_title}".encode()).hexdigest()
+            video_hash = self.get_video_key(video_id, video_title)
             
             # If we've already processed this video, skip it
-            if self.is_video_processed(video_hash):
+            if self.is_video_processed(video_hash, video_id, video_title):
                 self.log(f"⏭️ Thread: Video already processed for {channel_name}: {video_title[:50]}...", "info")
                 return []
             
+            # It is only marked processed once uploaded, so later ticks must not pick it up again
+            with self.in_progress_lock:
+                if video_hash in self.videos_in_progress:
+                    return []
+                self.videos_in_progress.add(video_hash)
+            
             self.log(f"🎉 Thread: Found NEW video for {channel_name}: {video_title}", "success")
             self.log(f"📅 Thread: Published: {published}")
             self.log(f"🍪 Thread: Will upload to TikTok account: {tiktok_cookie}")
             
             # Download the video
-            output_path = os.path.join(
-                os.path.abspath(self.config["download_path"]), 
-                f"{channel_name}_{video_id}.mp4"
-            )
+            output_path = os.path.join(self._download_path_abs, f"{channel_name}_{video_id}.mp4")
             
             downloaded_path = self.download_video(video_url, output_path)
             if not downloaded_path:
                 self.log(f"❌ Thread: Failed to download video for {channel_name}", "error")
+                with self.in_progress_lock:
+                    self.videos_in_progress.discard(video_hash)
                 return []
             
+            # Split on the split pool; this thread is free for the next check.
+            # finished resolves once the parts are uploaded and the video is marked processed
+            finished = concurrent.futures.Future()
+            with self.split_futures_lock:
+                self.split_futures.add(finished)
+            finished.add_done_callback(self._forget_split_future)
+            future = self.cpu_pool.submit(
+                self.process_downloaded_video, channel_info, downloaded_path, video_hash, video_id, video_title, finished
+            )
+            # A split cancelled at shutdown never runs, so nothing else would resolve finished
+            future.add_done_callback(lambda f: f.cancelled() and finished.cancel())
+            
+            # Return the video info for GUI updates
+            return [{
+                'title': video_title,
+                'url': video_url,
+                'id': video_id,
+                'published': published,
+                'channel_name': channel_name,
+                'tiktok_cookie': tiktok_cookie
+            }]
+                
+        except Exception as e:
+            self.log(f"❌ Thread: Error checking channel {channel_name}: {e}", "error")
+            import traceback
+            self.log(f"Thread error details for {channel_name}: {traceback.format_exc()}", "error")
+            return []
+    
+    def queue_cleanup(self, file_path, label):
+        """Hand a file that is no longer needed to the janitor thread"""
+        self._cleanup_q.put((file_path, label))
+    
+    def _remove_file(self, file_path, label):
+        """Delete one queued file, ignoring it if it is already gone"""
+        try:
+            os.unlink(file_path)
+            self.log(f"🧹 Cleaned up {label}", "info")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log(f"⚠️ Failed to clean up {label}: {e}", "warning")
+    
+    def _cleanup_worker(self):
+        """Background thread: delete queued files"""
+        while True:
+            self._remove_file(*self._cleanup_q.get())
+    
+    def _drain_cleanup(self):
+        """Delete whatever is still queued (at exit)"""
+        while True:
+            try:
+                self._remove_file(*self._cleanup_q.get_nowait())
+            except queue.Empty:
+                return
+    
+    def get_channel_proxy(self, channel_info):
+        """Channel proxy as "ip:port:username:password" (None if unset), formatted and logged once per channel"""
+        channel_key = channel_info.get("channel_id") or channel_info.get("name")
+        if channel_key in self._channel_proxies:
+            return self._channel_proxies[channel_key]
+        
+        channel_name = channel_info.get("name", "Unknown")
+        proxy_config = channel_info.get("proxy")
+        if proxy_config:
+            # Convert proxy dict to string format
+            proxy_string = f"{proxy_config['ip']}:{proxy_config['port']}:{proxy_config['username']}:{proxy_config['password']}"
+            self.log(f"🌐 Using proxy for channel {channel_name}: {proxy_config['ip']}:{proxy_config['port']}")
+        else:
+            proxy_string = None
+            self.log(f"📡 No proxy configured for channel {channel_name}")
+        self._channel_proxies[channel_key] = proxy_string
+        return proxy_string
+    
+    def _forget_split_future(self, future):
+        """Done-callback: stop tracking a finished split"""
+        with self.split_futures_lock:
+            self.split_futures.discard(future)
+    
+    def process_downloaded_video(self, channel_info, downloaded_path, video_hash, video_id, video_title, finished=None):
+        """Split a downloaded video and submit its part uploads (runs on the split pool)
+        
+        Only the split holds a split-pool slot; the video is marked processed and the
+        download removed by finish_uploaded_video once the last part upload completes.
+        
+        Args:
+            finished: Optional future resolved once the video has been fully handled
+        """
+        channel_name = channel_info.get("name", "Unknown")
+        tiktok_cookie = channel_info.get("tiktok_cookie", "default")
+        upload_futures = []
+        handed_off = False
+        
+        try:
+            # Same bytes as a video we already uploaded (e.g. only the title changed)?
+            content_digest = _file_digest(downloaded_path)
+            if self.is_content_processed(content_digest):
+                self.log(f"⏭️ Thread: Same video content already processed for {channel_name}: {video_title[:50]}...", "info")
+                self.mark_video_processed(video_hash, video_id, video_title)
+                self.queue_cleanup(downloaded_path, f"duplicate video for {channel_name}")
+                return
+            
             # Split the video into parts (TikTok max is 3 minutes) - use fewer parts for speed
             num_parts = min(3, self.config.get("video_parts", 3))  # Default to 3 parts for speed
             
             # Get proxy configuration for this channel
-            proxy_config = channel_info.get("proxy")
-            if proxy_config:
-                # Convert proxy dict to string format
-                proxy_string = f"{proxy_config['ip']}:{proxy_config['port']}:{proxy_config['username']}:{proxy_config['password']}"
-                self.log(f"🌐 Using proxy for channel {channel_name}: {proxy_config['ip']}:{proxy_config['port']}")
-            else:
-                proxy_string = None
-                self.log(f"📡 No proxy configured for channel {channel_name}")
+            proxy_string = self.get_channel_proxy(channel_info)
             
-            split_videos = self.split_video(downloaded_path, num_parts, video_title, tiktok_cookie, channel_name, proxy_string)
+            split_videos = self.split_video(downloaded_path, num_parts, video_title, tiktok_cookie, channel_name, proxy_string,
+                                            upload_futures=upload_futures)
             if not split_videos:
                 self.log(f"❌ Thread: Failed to split video for {channel_name}", "error")
-                return []
+                return
             
             # Uploads are now handled automatically in split_video function
             # Each part is uploaded immediately when it's created
@@ -668,66 +1182,91 @@ class YouTubeMonitor:
             else:
                 self.log(f"⚠️ Thread: Auto-upload disabled for {channel_name} - parts created but not uploaded", "warning")
             
+            # Finish from whichever upload thread completes last, leaving the split pool free
+            args = (channel_name, downloaded_path, video_hash, video_id, video_title, content_digest, finished)
+            handed_off = True
+            if not upload_futures:
+                self.finish_uploaded_video(*args)
+                return
+            remaining = [len(upload_futures)]
+            remaining_lock = threading.Lock()
+            
+            def on_upload_done(_future):
+                with remaining_lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    self.log(f"✅ Thread: All upload workers completed for {channel_name}", "success")
+                    self.finish_uploaded_video(*args)
+            
+            for upload_future in upload_futures:
+                upload_future.add_done_callback(on_upload_done)
+                
+        except Exception as e:
+            self.log(f"❌ Thread: Error processing video for {channel_name}: {e}", "error")
+            import traceback
+            self.log(f"Thread error details for {channel_name}: {traceback.format_exc()}", "error")
+        finally:
+            if not handed_off:
+                with self.in_progress_lock:
+                    self.videos_in_progress.discard(video_hash)
+                if finished is not None:
+                    finished.set_result(None)
+    
+    def finish_uploaded_video(self, channel_name, downloaded_path, video_hash, video_id, video_title, content_digest, finished=None):
+        """Mark a split video processed and remove its download once every part upload is done"""
+        try:
             # Mark video as processed
-            self.mark_video_processed(video_hash)
-            self.processed_videos.append(video_hash)
-            self.save_processed_videos()
+            self.mark_video_processed(video_hash, video_id, video_title)
+            self.mark_content_processed(content_digest, video_id)
             
             # Clean up the original downloaded file
-            try:
-                os.remove(downloaded_path)
-                self.log(f"🧹 Thread: Cleaned up original video for {channel_name}", "info")
-            except Exception as e:
-                self.log(f"⚠️ Thread: Failed to clean up original video for {channel_name}: {e}", "warning")
+            self.queue_cleanup(downloaded_path, f"original video for {channel_name}")
             
             self.log(f"✅ Thread: Completed processing for {channel_name}: {video_title}", "success")
             
-            # Return the video info for GUI updates
-            return [{
-                'title': video_title,
-                'url': video_url,
-                'id': video_id,
-                'published': published,
-                'channel_name': channel_name,
-                'tiktok_cookie': tiktok_cookie
-            }]
-                
         except Exception as e:
-            self.log(f"❌ Thread: Error checking channel {channel_name}: {e}", "error")
-            import traceback
-            self.log(f"Thread error details for {channel_name}: {traceback.format_exc()}", "error")
-            return []
+            self.log(f"❌ Thread: Error finishing video for {channel_name}: {e}", "error")
+        finally:
+            with self.in_progress_lock:
+                self.videos_in_progress.discard(video_hash)
+            if finished is not None:
+                finished.set_result(None)
     
-    def monitor_all_channels(self):
-        """Monitor all configured channels - THREADED VERSION with proper cookie handling"""
+    def monitor_all_channels(self, wait=True):
+        """Monitor all configured channels - THREADED VERSION with proper cookie handling
+        
+        Args:
+            wait: Block until every check, split and upload has finished. With False,
+                  wait at most check_interval_seconds so the next tick is not held up
+        """
         channel_count = len(self.config['channels'])
         self.log(f"🚀 Checking {channel_count} channels in parallel...")
         
-        # Create threads for each channel to process them simultaneously
-        threads = []
+        # Forget finished checks (and channels since removed from the config); only in-flight ones stay
+        self.channel_futures = {key: f for key, f in self.channel_futures.items() if not f.done()}
         
+        # Submit a check for each channel to process them simultaneously
         for channel in self.config['channels']:
-            thread = threading.Thread(
-                target=self.check_channel_for_new_videos,
-                args=(channel,),
-                daemon=True
-            )
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
-        
-        # AGGRESSIVE CACHING: Save caches periodically
-        if hasattr(self, 'save_counter'):
-            self.save_counter += 1
-        else:
-            self.save_counter = 1
+            channel_key = channel.get("channel_id") or channel.get("name")
+            if channel_key in self.channel_futures:
+                continue  # Still downloading from an earlier tick
+            self.channel_futures[channel_key] = self.io_pool.submit(self.check_channel_for_new_videos, channel)
         
-        if self.save_counter % 5 == 0:  # Save every 5 monitoring cycles
-            self.save_scrapetube_cache()
-            self.save_video_hash_cache()
+        # Opportunistically collect the checks; long downloads finish in the background
+        pending = [f for f in self.channel_futures.values() if not f.done()]
+        if wait:
+            concurrent.futures.wait(pending)
+            with self.split_futures_lock:
+                splits = list(self.split_futures)
+            concurrent.futures.wait(splits)
+        elif pending:
+            concurrent.futures.wait(pending, timeout=self.config.get("check_interval_seconds", 1))
+    
+    def stop_monitoring(self):
+        """Shut down the worker pools without waiting on queued checks, splits or uploads"""
+        for pool in (self.io_pool, self.cpu_pool, self.upload_executor):
+            pool.shutdown(wait=False, cancel_futures=True)
     
     def start_monitoring(self):
         """Start the monitoring service"""
@@ -746,25 +1285,39 @@ class YouTubeMonitor:
         self.log("\n🎯 Press Ctrl+C to stop monitoring")
         self.log("=" * 60)
         
-        check_count = 0
+        self.check_count = 0
+        self.restart_failures = 0
         try:
+            # Restart in place after an error (recursing would add a stack frame per crash)
             while True:
-                check_count += 1
-                self.log(f"\n🔄 Check #{check_count} - {datetime.now().strftime('%H:%M:%S')}")
-                
-                # Run the threaded check
-                self.monitor_all_channels()
-                
-                # No wait - maximum speed
-                # Continuous monitoring with no delays
+                try:
+                    self._monitor_forever(interval)
+                except Exception as e:
+                    self.restart_failures += 1
+                    # Back off 1s, 2s, 4s... up to 30s so a persistent error doesn't spin
+                    delay = min(2 ** (self.restart_failures - 1), 30)
+                    self.log(f"❌ Monitoring error: {e}", "error")
+                    self.log(f"🔄 Restarting monitoring in {delay}s...")
+                    time.sleep(delay)
                 
         except KeyboardInterrupt:
             self.log("\n⏹️ Monitoring stopped by user")
-        except Exception as e:
-            self.log(f"❌ Monitoring error: {e}", "error")
-            self.log("🔄 Restarting monitoring immediately...")
-            # No delay - restart immediately
-            self.start_monitoring()
+            self.stop_monitoring()
+    
+    def _monitor_forever(self, interval):
+        """Run monitoring cycles until an exception escapes"""
+        while True:
+            self.check_count += 1
+            cycle_start = time.monotonic()
+            # log() (and the GUI's log_message) already stamp the time
+            self.log(f"\n🔄 Check #{self.check_count}")
+            
+            # Run the threaded check (the pools bound how many channels run at once)
+            self.monitor_all_channels(wait=False)
+            self.restart_failures = 0  # A clean cycle resets the restart backoff
+            
+            # Start at most one cycle per interval; re-polling sooner only spins on the scrapetube cache
+            time.sleep(max(0.0, interval - (time.monotonic() - cycle_start)))
 
 def main():
     parser = argparse.ArgumentParser(description="YouTube Channel Monitor and TikTok Auto-Uploader (Scrapetube Version)")
@@ -786,13 +1339,18 @@ def main():
             channel_id = parts[1].strip()
             tiktok_cookie = parts[2].strip() if len(parts) > 2 else "default"
             
+            # A duplicate entry would be checked (and uploaded) twice every cycle
+            channels_by_name = {ch.get("name"): ch for ch in monitor.config["channels"]}
+            if name in channels_by_name:
+                print(f"Channel already exists: {name}")
+                return
+            
             monitor.config["channels"].append({
                 "name": name,
                 "channel_id": channel_id,
                 "tiktok_cookie": tiktok_cookie
             })
-            with open(args.config, 'w') as f:
-                json.dump(monitor.config, f, indent=4)
+            _dump_json_atomic(args.config, monitor.config, indent=4)
             print(f"Added channel: {name} with TikTok cookie: {tiktok_cookie}")
         else:
             print("Invalid format. Use: name,channel_id,tiktok_cookie")
@@ -803,12 +1361,15 @@ def main():
             print(f"  - {channel['name']}: {channel['channel_id']} (TikTok: {channel.get('tiktok_cookie', 'default')})")
     
     elif args.remove_channel:
+        channels_by_name = {ch.get("name"): ch for ch in monitor.config["channels"]}
+        if args.remove_channel not in channels_by_name:
+            print(f"Channel not found: {args.remove_channel}")
+            return
         monitor.config["channels"] = [
             ch for ch in monitor.config["channels"] 
-            if ch["name"] != args.remove_channel
+            if ch.get("name") != args.remove_channel
         ]
-        with open(args.config, 'w') as f:
-            json.dump(monitor.config, f, indent=4)
+        _dump_json_atomic(args.config, monitor.config, indent=4)
         print(f"Removed channel: {args.remove_channel}")
     
     elif args.check_once:
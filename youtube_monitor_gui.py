@@ -7,6 +7,7 @@ import os
 import time
 from datetime import datetime
 import queue
+import sqlite3
 import sys
 import asyncio
 from youtube_monitor_pubsub import YouTubeMonitorPubSub
@@ -329,14 +330,25 @@ class YouTubeMonitorGUI:
                 channels_count = len(config.get("channels", []))
                 self.channels_count_label.config(text=str(channels_count))
                 
-                # Load processed videos count
+                # Load processed videos count: the GUI/pubsub pipeline records them in
+                # processed_videos_file, the command-line monitor in processed.db
+                processed_count = 0
                 processed_file = config.get("processed_videos_file", "processed_videos.json")
                 if os.path.exists(processed_file):
                     with open(processed_file, 'r') as f:
-                        processed_videos = json.load(f)
-                    self.processed_count_label.config(text=str(len(processed_videos)))
-                else:
-                    self.processed_count_label.config(text="0")
+                        processed_count += len(json.load(f))
+                
+                processed_db = config.get("processed_db_file", "processed.db")
+                if os.path.exists(processed_db):
+                    db = sqlite3.connect(processed_db)
+                    try:
+                        processed_count += db.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+                    except sqlite3.OperationalError:
+                        pass  # Table not created yet
+                    finally:
+                        db.close()
+                
+                self.processed_count_label.config(text=str(processed_count))
                 
                 self.port_label.config(text=str(config.get('pubsub_port', 8080)))
                 